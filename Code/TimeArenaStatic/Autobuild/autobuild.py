@@ -7,6 +7,7 @@ from TimeArena import *
 import re
 
 from Agent import *
+from agent_utils import checkpoint_path, append_checkpoint, restore_checkpoint, clear_checkpoint
 
 import autogen
 from autogen import ConversableAgent
@@ -107,8 +108,12 @@ def RunData(args):
         agent_list, agent_configs = builder.build(building_task, default_llm_config, coding=False)
         saved_path = builder.save(os.path.join(save_folder, "agents.json"))
 
+    checkpoint = checkpoint_path(os.path.join(save_folder, filename))
+    restored = restore_checkpoint(checkpoint, data)
     print("####################################")
     print(len(data), "Samples") 
+    if restored:
+        print(restored, "Samples restored from", checkpoint)
     print("####################################")
     for i in range(len(data)):
         if "plan" in data[i]:
@@ -135,8 +140,11 @@ def RunData(args):
             data[i]["cost"] = final_output.cost
             cost_summary = gather_usage_summary(agent_list)
             data[i]["cost_agents"] = cost_summary
-            with open(filepath, 'w') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
+            append_checkpoint(checkpoint, i, data[i])
+
+    with open(filepath, 'w') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    clear_checkpoint(checkpoint)
     
 
 def postprocess(reply):
@@ -12,6 +12,7 @@ from EvalArena import *
 import re
 
 from Agent import *
+from agent_utils import checkpoint_path, append_checkpoint, restore_checkpoint, clear_checkpoint
 
 import autogen
 from autogen import ConversableAgent
@@ -45,6 +46,7 @@ def RunData(args):
     save_folder = "Outputs/TimeArena/" + strategy_name + "/" + model
     input_file_path = "Data/TimeArena"
     filename = "val.json"
+    eval_cache_dir = "Outputs/TimeArena/eval_cache"
     # TODO ENDS
     
     if not os.path.exists(save_folder):
@@ -58,8 +60,12 @@ def RunData(args):
         data = json.load(open(filepath, 'r'))
     else:
         raise ValueError(f"File {filepath} does not exist.")
+    checkpoint = checkpoint_path(save_path)
+    restored = restore_checkpoint(checkpoint, data)
     print("####################################")
     print(len(data), "Samples") 
+    if restored:
+        print(restored, "Samples restored from", checkpoint)
     print("####################################")
     for i in range(len(data)):
         if "plan" in data[i]:
@@ -80,11 +86,14 @@ def RunData(args):
             data[i]["raw_reply"] = agent_reply
             cost_summary = gather_usage_summary([agent])
             data[i]["cost"] = cost_summary
-            with open(save_path, 'w') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
+            append_checkpoint(checkpoint, i, data[i])
+
+    with open(save_path, 'w') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    clear_checkpoint(checkpoint)
 
     
-    scores, detailed_scores, detailed_feedback = timearena_feedback(None, data, None, False)
+    scores, detailed_scores, detailed_feedback = timearena_feedback(None, data, None, False, cache_dir=eval_cache_dir)
 
     with open(save_path.replace(".json", "_scored.json"), "w") as file:
         my_dict = {
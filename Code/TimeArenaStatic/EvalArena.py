@@ -1,3 +1,13 @@
+import hashlib
+import heapq
+import itertools
+import json
+import os
+from collections import Counter
+
+from algorithm.cal_oracle import combo_lower_bound
+from algorithm.dependency_registry import sample_graphs, intern_graphs
+
 def normalize_action(action_name):
     """
     Normalize an action name by stripping whitespace and removing a trailing '*' if present.
@@ -43,16 +53,68 @@ def parse_plan(plan):
 
 def consume_action(available_actions, act):
     """
-    Consumes one occurrence of an action (by normalized name) from the available_actions list.
+    Consumes one occurrence of an action (by normalized name) from the available_actions multiset,
+    a Counter of normalized action names.
     Returns True if an occurrence was found and removed, else False.
     """
     norm_act = normalize_action(act)
-    for i, a in enumerate(available_actions):
-        if normalize_action(a) == norm_act:
-            del available_actions[i]
-            return True
+    if available_actions[norm_act] > 0:
+        available_actions[norm_act] -= 1
+        return True
     return False
 
+def compile_action_index(tasks):
+    """
+    Compiles the dependency graph of a set of tasks into a reverse index, built once per evaluation.
+    
+    Returns a dict mapping each normalized action name to { task: [ (action, idle, dependencies), ... ] }, where
+    action is the canonical name from the task's durations, idle tells whether it is an idle ('*') action, and
+    dependencies is a list of (dependency, resolved_dependency) pairs. resolved_dependency is the task action the
+    dependency normalizes to, or None if the task has no such action.
+    """
+    index = {}
+    for task, (durations, deps) in tasks.items():
+        canonical = {}
+        for task_act in durations:
+            canonical.setdefault(normalize_action(task_act), task_act)
+        for task_act in durations:
+            resolved = [(dep, canonical.get(normalize_action(dep))) for dep in deps.get(task_act, [])]
+            entries = index.setdefault(normalize_action(task_act), {}).setdefault(task, [])
+            entries.append((task_act, is_idle_action(task_act), resolved))
+    return index
+
+def candidate_entries(action_index, available_actions, task):
+    """
+    Returns the index entries of `task` matched by the still available actions, without duplicates
+    and in the order the actions appear in the plan.
+    """
+    candidates = []
+    for norm_act, count in available_actions.items():
+        if count > 0 and norm_act.lower() != "wait":
+            candidates.extend(action_index.get(norm_act, {}).get(task, ()))
+    return list({entry[0]: entry for entry in candidates}.values())
+
+def percentage(completed_duration, total_duration):
+    """
+    Returns the completed duration as a percentage of the total duration (0 for an empty task).
+    """
+    return (completed_duration / total_duration) * 100 if total_duration > 0 else 0
+
+def expand_progress(changes, initial, end):
+    """
+    Expands a list of (time, percentage) change points, sorted by time, into a per-minute
+    progress series {t: percentage} for t in [0, end).
+    """
+    series = {}
+    value = initial
+    idx = 0
+    for t in range(end):
+        while idx < len(changes) and changes[idx][0] <= t:
+            value = changes[idx][1]
+            idx += 1
+        series[t] = value
+    return series
+
 def evaluate_plan(tasks, plan):
     """
     Evaluate the plan against a set of tasks with the following rules:
@@ -98,6 +160,9 @@ def evaluate_plan(tasks, plan):
     # Use a fixed order for tasks.
     tasks_order = list(tasks.keys())
     
+    # Resolve every action name and dependency once, instead of normalizing names at every time step.
+    action_index = compile_action_index(tasks)
+    
     # Initialize a schedule for each task.
     # For each task, we record scheduled actions as:
     #    schedule[task][action] = { start_time, finish_time, completed, duration, idle }
@@ -110,161 +175,149 @@ def evaluate_plan(tasks, plan):
     # (This was previously per-task; now we enforce a global check later.)
     non_idle_lock = { task: None for task in tasks }
     
-    # For progress speed: record progress (percentage complete) per time step for each task.
-    progress_speed = { task: {} for task in tasks }
-    
+    # Pending completions as a heap of (finish_time, sequence, task, action). Scheduled actions are
+    # pushed here, so the simulation only visits plan entries and finish times instead of every minute.
+    pending = []
+    sequence = 0
+
+    # For progress speed: the completed duration per task, and the (time, percentage) points at which it changed.
+    total_durations = { task: sum(durations.values()) for task, (durations, _) in tasks.items() }
+    completed_durations = { task: 0 for task in tasks }
+    progress_changes = { task: [] for task in tasks }
+
     # Determine simulation end time.
     max_plan_time = max(plan_dict.keys()) if plan_dict else 0
     max_duration = max(max(durations.values()) for durations, _ in tasks.values()) if tasks else 0
     simulation_end = max_plan_time + max_duration + 1  # +1 to allow completions
-    
-    # Simulation loop: step through each minute.
-    for t in range(simulation_end):
-        # First, mark any actions that finish exactly at this time.
-        for task in tasks_order:
-            for act, record in schedule[task].items():
-                if not record.get("completed", False) and record["finish_time"] == t:
-                    record["completed"] = True
-                    # If this was a non-idle action, release its lock.
-                    if not record["idle"]:
-                        if non_idle_lock[task] == record["finish_time"]:
-                            non_idle_lock[task] = None
+
+    def complete_actions(until):
+        # Mark every action that finishes at or before `until` (and inside the simulation) as completed.
+        while pending and pending[0][0] <= until and pending[0][0] < simulation_end:
+            finish_time, _, task, act = heapq.heappop(pending)
+            record = schedule[task][act]
+            record["completed"] = True
+            # If this was a non-idle action, release its lock.
+            if not record["idle"]:
+                if non_idle_lock[task] == record["finish_time"]:
+                    non_idle_lock[task] = None
+            completed_durations[task] += record["duration"]
+            progress_changes[task].append(
+                (finish_time, percentage(completed_durations[task], total_durations[task]))
+            )
+
+    # Simulation loop: jump between the time steps that carry plan entries.
+    for t in sorted(time for time in plan_dict if 0 <= time < simulation_end):
+        # First, mark any actions that finish by this time.
+        complete_actions(t)
+
+        # If the only entry is "wait", then skip processing for this time step.
+        if len(plan_dict[t]) == 1 and normalize_action(plan_dict[t][0]).lower() == "wait":
+            continue
+        # Count the actions available at this time step by normalized name.
+        available_actions = Counter(normalize_action(a) for a in plan_dict[t])
         
-        # At the end of this time step, record progress for each task.
-        for task, (durations, _) in tasks.items():
-            total_duration = sum(durations.values())
-            completed_duration = sum(durations[act] for act in durations 
-                                     if act in schedule[task] and schedule[task][act].get("completed", False))
-            percentage_complete = (completed_duration / total_duration) * 100 if total_duration > 0 else 0
-            progress_speed[task][t] = percentage_complete
+        # Global lock check: if any task has a non-idle lock active, no actions may be started.
+        if any(non_idle_lock[task] is not None and t < non_idle_lock[task] for task in tasks_order):
+            for task in tasks_order:
+                for act, _, _ in candidate_entries(action_index, available_actions, task):
+                    errors[task].append(
+                        f"Action '{act}' initiated at time {t} while a non-idle action is underway (global lock)."
+                    )
+            continue  # Skip processing all tasks at this time step.
         
-        # Process the plan entry for time t (if any).
-        if t in plan_dict:
-            # Create a copy of the actions available at this time step.
-            available_actions = list(plan_dict[t])
-            # If the only entry is "wait", then skip processing for this time step.
-            if len(available_actions) == 1 and normalize_action(available_actions[0]).lower() == "wait":
-                continue
+        # If no global lock is active, iterate over tasks in a fixed order.
+        for task in tasks_order:
+            durations = tasks[task][0]
             
-            # Global lock check: if any task has a non-idle lock active, no actions may be started.
-            if any(non_idle_lock[task] is not None and t < non_idle_lock[task] for task in tasks_order):
-                for task in tasks_order:
-                    # Build candidate actions for this task.
-                    durations = tasks[task][0]
-                    candidate_actions = []
-                    for act_str in available_actions:
-                        norm_act = normalize_action(act_str)
-                        if norm_act.lower() == "wait":
-                            continue
-                        for task_act in durations:
-                            if normalize_action(task_act) == norm_act:
-                                candidate_actions.append(task_act)
-                    candidate_actions = list(set(candidate_actions))
-                    for act in candidate_actions:
-                        errors[task].append(
-                            f"Action '{act}' initiated at time {t} while a non-idle action is underway (global lock)."
-                        )
-                continue  # Skip processing all tasks at this time step.
+            # Build candidate actions for this task from the available actions.
+            candidate_actions = candidate_entries(action_index, available_actions, task)
             
-            # If no global lock is active, iterate over tasks in a fixed order.
-            for task in tasks_order:
-                durations, deps = tasks[task]
-                
-                # Build candidate actions for this task from the available actions.
-                candidate_actions = []
-                for act_str in available_actions:
-                    norm_act = normalize_action(act_str)
-                    if norm_act.lower() == "wait":
-                        continue
-                    for task_act in durations:
-                        if normalize_action(task_act) == norm_act:
-                            candidate_actions.append(task_act)
-                candidate_actions = list(set(candidate_actions))
-                
-                # Process non-idle candidates first.
-                non_idle_candidates = [act for act in candidate_actions if not is_idle_action(act)]
-                if len(non_idle_candidates) > 1:
-                    errors[task].append(f"At time {t}, more than one non-idle action initiated: {non_idle_candidates}.")
-                    non_idle_candidates = []
-                if non_idle_candidates:
-                    act = non_idle_candidates[0]
-                    if act in schedule[task]:
-                        errors[task].append(f"Non-idle action '{act}' initiated more than once (at time {t}).")
-                    else:
-                        deps_met = True
-                        if act in deps:
-                            for dep in deps[act]:
-                                dep_candidate = None
-                                for candidate in durations:
-                                    if normalize_action(candidate) == normalize_action(dep):
-                                        dep_candidate = candidate
-                                        break
-                                if dep_candidate is None:
-                                    errors[task].append(f"Dependency '{dep}' for action '{act}' not found in task.")
-                                    deps_met = False
-                                    break
-                                if (dep_candidate not in schedule[task] or 
-                                    not schedule[task][dep_candidate].get("completed", False) or 
-                                    schedule[task][dep_candidate]["finish_time"] > t):
-                                    errors[task].append(
-                                        f"Non-idle action '{act}' started at time {t} before dependency '{dep_candidate}' completed."
-                                    )
-                                    deps_met = False
-                                    break
-                        if deps_met:
-                            duration = durations[act]
-                            schedule[task][act] = {
-                                "start_time": t,
-                                "finish_time": t + duration,
-                                "completed": False,
-                                "duration": duration,
-                                "idle": False
-                            }
-                            # Lock the task until this non-idle action completes.
-                            non_idle_lock[task] = t + duration
-                            consume_action(available_actions, act)
-                
-                # Process idle candidates (multiple idle actions are allowed).
-                idle_candidates = [act for act in candidate_actions if is_idle_action(act)]
-                for act in idle_candidates:
-                    if act in schedule[task]:
-                        errors[task].append(f"Idle action '{act}' initiated more than once (at time {t}).")
-                        continue
+            # Process non-idle candidates first.
+            non_idle_candidates = [entry for entry in candidate_actions if not entry[1]]
+            if len(non_idle_candidates) > 1:
+                errors[task].append(f"At time {t}, more than one non-idle action initiated: {[entry[0] for entry in non_idle_candidates]}.")
+                non_idle_candidates = []
+            if non_idle_candidates:
+                act, _, act_deps = non_idle_candidates[0]
+                if act in schedule[task]:
+                    errors[task].append(f"Non-idle action '{act}' initiated more than once (at time {t}).")
+                else:
                     deps_met = True
-                    if act in deps:
-                        for dep in deps[act]:
-                            dep_candidate = None
-                            for candidate in durations:
-                                if normalize_action(candidate) == normalize_action(dep):
-                                    dep_candidate = candidate
-                                    break
-                            if dep_candidate is None:
-                                errors[task].append(f"Dependency '{dep}' for idle action '{act}' not found in task.")
-                                deps_met = False
-                                break
-                            if (dep_candidate not in schedule[task] or 
-                                not schedule[task][dep_candidate].get("completed", False) or 
-                                schedule[task][dep_candidate]["finish_time"] > t):
-                                errors[task].append(
-                                    f"Idle action '{act}' initiated at time {t} before dependency '{dep_candidate}' completed."
-                                )
-                                deps_met = False
-                                break
+                    for dep, dep_candidate in act_deps:
+                        if dep_candidate is None:
+                            errors[task].append(f"Dependency '{dep}' for action '{act}' not found in task.")
+                            deps_met = False
+                            break
+                        if (dep_candidate not in schedule[task] or 
+                            not schedule[task][dep_candidate].get("completed", False) or 
+                            schedule[task][dep_candidate]["finish_time"] > t):
+                            errors[task].append(
+                                f"Non-idle action '{act}' started at time {t} before dependency '{dep_candidate}' completed."
+                            )
+                            deps_met = False
+                            break
                     if deps_met:
+                        duration = durations[act]
                         schedule[task][act] = {
                             "start_time": t,
-                            "finish_time": t + durations[act],
+                            "finish_time": t + duration,
                             "completed": False,
-                            "duration": durations[act],
-                            "idle": True
+                            "duration": duration,
+                            "idle": False
                         }
+                        if duration > 0:
+                            heapq.heappush(pending, (t + duration, sequence, task, act))
+                            sequence += 1
+                        # Lock the task until this non-idle action completes.
+                        non_idle_lock[task] = t + duration
                         consume_action(available_actions, act)
-    
-    # --- Prune progress_speed: for each task, only keep time steps up to the last action finish time.
-    for task in progress_speed:
+            
+            # Process idle candidates (multiple idle actions are allowed).
+            idle_candidates = [entry for entry in candidate_actions if entry[1]]
+            for act, _, act_deps in idle_candidates:
+                if act in schedule[task]:
+                    errors[task].append(f"Idle action '{act}' initiated more than once (at time {t}).")
+                    continue
+                deps_met = True
+                for dep, dep_candidate in act_deps:
+                    if dep_candidate is None:
+                        errors[task].append(f"Dependency '{dep}' for idle action '{act}' not found in task.")
+                        deps_met = False
+                        break
+                    if (dep_candidate not in schedule[task] or 
+                        not schedule[task][dep_candidate].get("completed", False) or 
+                        schedule[task][dep_candidate]["finish_time"] > t):
+                        errors[task].append(
+                            f"Idle action '{act}' initiated at time {t} before dependency '{dep_candidate}' completed."
+                        )
+                        deps_met = False
+                        break
+                if deps_met:
+                    schedule[task][act] = {
+                        "start_time": t,
+                        "finish_time": t + durations[act],
+                        "completed": False,
+                        "duration": durations[act],
+                        "idle": True
+                    }
+                    if durations[act] > 0:
+                        heapq.heappush(pending, (t + durations[act], sequence, task, act))
+                        sequence += 1
+                    consume_action(available_actions, act)
+
+    # Complete everything still in flight before the simulation ends.
+    complete_actions(simulation_end - 1)
+
+    # --- Build progress_speed: for each task, only keep time steps up to the last action finish time.
+    progress_speed = {}
+    for task in tasks_order:
         if schedule[task]:
             max_finish = max(record["finish_time"] for record in schedule[task].values())
-            progress_speed[task] = { t: prog for t, prog in progress_speed[task].items() if t <= max_finish }
+            progress_speed[task] = expand_progress(
+                progress_changes[task],
+                percentage(0, total_durations[task]),
+                min(max_finish, simulation_end - 1) + 1
+            )
         else:
             progress_speed[task] = { t: 0 for t in range(simulation_end) }
     
@@ -304,246 +357,457 @@ def evaluate_plan(tasks, plan):
     return overall_result
 
 
-# return scores, detailed scores, detailed feedback
-# cumulative # divided # idx query plan - detailed_evaluation
-def timearena_feedback(set_type: str, plans: list, indices: list, llm_config_list: list = None, llm_feedback_flag = False):
-    tcost = 0
-    prog = 0
-    cnt = 0
-    pcnt = 0
-    fullcnt = 0
-    avgctime = 0
-    avgpspeed = [0,0]
-    lprog = [0]*3
-    lcnt = [0]*3
-    lpcnt = [0]*3
-    lfullcnt = [0]*3
-    lavgctime = [0]*3
-    lavgpspeed = [[0,0]]*3
-    cnt_idle_violated = 0
-    lcnt_idle_violated = [0]*3
-    cnt_dependency_violated = 0
-    lcnt_dependency_violated = [0]*3
-    import copy
-    data = copy.deepcopy(plans)
+def evaluate_job(job):
+    """
+    Evaluates one (dependency_graph, plan) pair. Returns (result, None), or (None, error message) if the
+    plan could not be evaluated. Module-level so that it can be dispatched to worker processes.
+    """
+    dependency_graph, plan = job
+    try:
+        return evaluate_plan(dependency_graph, plan), None
+    except Exception as e:
+        return None, str(e)
+
+class EvaluationCache:
+    """
+    Disk-backed store of evaluate_job outcomes, keyed by a stable hash of (plan lines, dependency_graph).
+    Keeps hit/miss counters so callers can report how much work a rerun actually did. The drivers share one
+    directory across strategies, so a plan that was already scored by any of them is not evaluated again.
+    """
+    # Bump whenever evaluate_plan changes its results, so that stale entries are not reused.
+    VERSION = 1
+
+    def __init__(self, directory):
+        import diskcache
+        self.store = diskcache.Cache(directory)
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def key(cls, job):
+        dependency_graph, plan = job
+        # No sort_keys: task and action order change the evaluation (fixed task order, consumption order).
+        payload = json.dumps([cls.VERSION, plan, dependency_graph], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, job):
+        outcome = self.store.get(self.key(job))
+        if outcome is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return outcome
+
+    def set(self, job, outcome):
+        self.store.set(self.key(job), outcome)
+
+    def close(self):
+        self.store.close()
+
+def evaluate_jobs(jobs, workers=1, chunksize=None, cache=None, progress=True):
+    """
+    Evaluates a list of (dependency_graph, plan) pairs, serially or across a pool of `workers` processes.
+    With a cache, only the pairs not found in it are evaluated, and their outcomes are stored.
+    Results are returned in the order of `jobs` either way. progress=False hides the progress bar.
+    """
     from tqdm import tqdm
-    for i in tqdm(range(len(data))):
-        if "plan" in data[i]:
-            try:
-                result = evaluate_plan(data[i]['dependency_graph'], data[i]['plan'])
-            except Exception as e:
-                print(f"Error evaluating plan at index {i}: {e}")
-                result = {
-                    "final_results": {},
-                    "error": str(e)
-                }
-                data[i]['eval'] = result
-                continue
-            data[i]['eval'] = result
-            
+    outcomes = [cache.get(job) for job in jobs] if cache is not None else [None] * len(jobs)
+    missing = [i for i, outcome in enumerate(outcomes) if outcome is None]
+    pending_jobs = [jobs[i] for i in missing]
+    if workers <= 1 or len(pending_jobs) <= 1:
+        computed = [evaluate_job(job) for job in tqdm(pending_jobs, disable=not progress)]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        if chunksize is None:
+            chunksize = max(1, len(pending_jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            computed = list(tqdm(pool.map(evaluate_job, pending_jobs, chunksize=chunksize), total=len(pending_jobs), disable=not progress))
+    for i, outcome in zip(missing, computed):
+        outcomes[i] = outcome
+        if cache is not None:
+            cache.set(jobs[i], outcome)
+    return outcomes
+
+
+def evaluate_samples(samples, workers=1, cache=None, progress=True):
+    """
+    evaluate_jobs over planned samples. Returns one (result, error) outcome per sample in order, and the resolved
+    dependency graphs of each sample (None where they could not be resolved) for FeedbackAccumulator.add. Graphs are
+    resolved per sample: a sample whose graphs cannot be resolved gets an error outcome like any other plan that
+    fails to evaluate, instead of stopping the run. Embedded graphs equal to a registry graph are interned, so the
+    jobs sent to worker processes carry one copy per task.
+    """
+    outcomes = [None] * len(samples)
+    resolved_graphs = [None] * len(samples)
+    resolved = []
+    jobs = []
+    for n, sample in enumerate(samples):
+        try:
+            graphs = sample_graphs(sample)
+        except Exception as e:
+            outcomes[n] = (None, f"cannot resolve dependency graphs: {e!r}")
+            continue
+        if sample.get('dependency_graph') is not None:
+            graphs = intern_graphs(graphs)
+        resolved_graphs[n] = graphs
+        resolved.append(n)
+        jobs.append((graphs, sample['plan']))
+    for n, outcome in zip(resolved, evaluate_jobs(jobs, workers=workers, cache=cache, progress=progress)):
+        outcomes[n] = outcome
+    return outcomes, resolved_graphs
+
+
+class FeedbackAccumulator:
+    """
+    Running aggregates of timearena_feedback. Samples are added one at a time in order and only the counters are
+    kept, so scores can be computed over any number of samples without holding them.
+    """
+    def __init__(self):
+        self.total_samples = 0
+        self.tcost = 0
+        self.prog = 0
+        self.cnt = 0
+        self.pcnt = 0
+        self.fullcnt = 0
+        self.avgctime = 0
+        self.avgpspeed = [0,0]
+        self.lprog = [0]*3
+        self.lcnt = [0]*3
+        self.lpcnt = [0]*3
+        self.lfullcnt = [0]*3
+        self.lavgctime = [0]*3
+        self.lavgpspeed = [[0,0]]*3
+        self.cnt_idle_violated = 0
+        self.lcnt_idle_violated = [0]*3
+        self.cnt_dependency_violated = 0
+        self.lcnt_dependency_violated = [0]*3
+        self.bound_gap = 0
+        self.bound_cnt = 0
+        self.lbound_gap = [0]*3
+        self.lbound_cnt = [0]*3
+
+    def add(self, sample, outcome=None, index=None, graphs=None):
+        """
+        Adds one sample with the (result, error) outcome of evaluate_job. Planned samples get their 'eval' (and
+        'lower_bound'/'bound_gap') keys set, as in the data returned by timearena_feedback. graphs are the sample's
+        dependency graphs when the caller already resolved them.
+        """
+        self.total_samples += 1
+        if "plan" not in sample:
+            print(f"missing plan at index {index}")
+            return
+        result, error = outcome
+        if error is not None:
+            print(f"Error evaluating plan at index {index}: {error}")
+            result = {
+                "final_results": {},
+                "error": error
+            }
+            sample['eval'] = result
+            return
+        sample['eval'] = result
+
+        try:
+            self.tcost += sample['cost']['usage_including_cached_inference']['total_cost']
+            if 'cost_agents' in sample:
+                self.tcost += sample['cost_agents']['usage_including_cached_inference']['total_cost']
+        except:
+            pass
+        flag = True
+        ind = result['total_tasks'] - 1
+        for j in result['final_results']:
+            flag_idle = False
+            flag_dependency = False
+            for k in result['final_results'][j]['errors']:
+                if "dependency" in k:
+                    flag_dependency = True
+                if "global lock" in k:
+                    flag_idle = True
+
+            if flag_idle:
+                self.cnt_idle_violated += 1
+                self.lcnt_idle_violated[ind] += 1
+            if flag_dependency:
+                self.cnt_dependency_violated += 1
+                self.lcnt_dependency_violated[ind] += 1
+
+            self.prog += result['final_results'][j]['percentage_complete']
+            self.lprog[ind] += result['final_results'][j]['percentage_complete']
+            self.pcnt += 1
+            self.lpcnt[ind] += 1
+            if result['final_results'][j]['fully_completed']:
+                self.cnt += 1
+                self.lcnt[ind] += 1
+            else:
+                flag = False
+        if flag:
+            self.fullcnt += 1
+            self.lfullcnt[ind] += 1
+        for j in result['progress_speed']:
             try:
-                tcost += data[i]['cost']['usage_including_cached_inference']['total_cost']
-                if 'cost_agents' in data[i]:
-                    tcost += data[i]['cost_agents']['usage_including_cached_inference']['total_cost']
-            except:
-                pass
-            flag = True
-            ind = result['total_tasks'] - 1
-            for j in result['final_results']:
-                flag_idle = False
-                flag_dependency = False
-                for k in result['final_results'][j]['errors']:
-                    if "dependency" in k:
-                        flag_dependency = True
-                    if "global lock" in k:
-                        flag_idle = True
-                
-                if flag_idle:
-                    cnt_idle_violated += 1
-                    lcnt_idle_violated[ind] += 1
-                if flag_dependency:
-                    cnt_dependency_violated += 1
-                    lcnt_dependency_violated[ind] += 1
-                
-                prog += result['final_results'][j]['percentage_complete'] 
-                lprog[ind] += result['final_results'][j]['percentage_complete']
-                pcnt += 1
-                lpcnt[ind] += 1
-                if result['final_results'][j]['fully_completed']:
-                    cnt += 1
-                    lcnt[ind] += 1
-                else:
-                    flag = False
-            if flag:
-                fullcnt += 1
-                lfullcnt[ind] += 1
-            for j in result['progress_speed']:
-                try:
-                    avgpspeed[0] +=  result['progress_speed'][j][(len(list(result['progress_speed'][j].keys()))-1)]
-                    avgpspeed[1] +=  len(list(result['progress_speed'][j].keys()))-1
-                    lavgpspeed[ind][0] +=  result['progress_speed'][j][(len(list(result['progress_speed'][j].keys()))-1)]
-                    lavgpspeed[ind][1] +=  len(list(result['progress_speed'][j].keys()))-1 
-                except KeyError as e:
-                    print(f"Error in progress speed for task {j}: {result['progress_speed'][j]}")
-                    raise e
-                
-            for j in result['completion_time']:
-                if result['completion_time'][j] is not None:
-                    avgctime += result['completion_time'][j]
-                    lavgctime[ind] += result['completion_time'][j]
-            
-            
-        else:
-            print(f"missing plan at index {i}")
-    ret = {}   
-    ret["scores"] = {
-        "fully_completed_samples": fullcnt,
-        "fully_completed_samples_percentage": fullcnt / len(data) if len(data) > 0 else 0,
-        "completed_tasks": cnt,
-        "completed_tasks_percentage": cnt / pcnt if pcnt > 0 else 0,
-        "avg_progress": prog / pcnt if pcnt > 0 else 0,
-        "avg_completion_time": avgctime / cnt if cnt > 0 else 0,
-        "avg_progress_speed": avgpspeed[0] / avgpspeed[1] if avgpspeed[1] > 0 else 0,
-        "tasks_with_idle_violation" : cnt_idle_violated,
-        "tasks_with_dependency_violation" : cnt_dependency_violated,
-        "total_tasks": pcnt,
-        "total_samples": len(data),
-        "cost": tcost,   
-    }
-    ret["detailed_scores"] = []
-    for i in range(3):
-        a={}
-        a["fully_completed_samples"] = lfullcnt[i]
-        a["completed_tasks"] = lcnt[i]
-        a["avg_progress"] = lprog[i] / lpcnt[i] if lpcnt[i] > 0 else 0
-        a["avg_completion_time"] = lavgctime[i] / lcnt[i] if lcnt[i] > 0 else 0
-        a["avg_progress_speed"] = lavgpspeed[i][0] / lavgpspeed[i][1] if lavgpspeed[i][1] > 0 else 0
-        a["tasks_with_idle_violation"] = lcnt_idle_violated[i]
-        a["tasks_with_dependency_violation"] = lcnt_dependency_violated[i]
-        a["#tasks"] = i+1
-        a["total_tasks"] = lpcnt[i]
-        
-        ret["detailed_scores"].append(a)
-    ret["detailed_feedback"] = []
+                self.avgpspeed[0] +=  result['progress_speed'][j][(len(list(result['progress_speed'][j].keys()))-1)]
+                self.avgpspeed[1] +=  len(list(result['progress_speed'][j].keys()))-1
+                self.lavgpspeed[ind][0] +=  result['progress_speed'][j][(len(list(result['progress_speed'][j].keys()))-1)]
+                self.lavgpspeed[ind][1] +=  len(list(result['progress_speed'][j].keys()))-1
+            except KeyError as e:
+                print(f"Error in progress speed for task {j}: {result['progress_speed'][j]}")
+                raise e
+
+        for j in result['completion_time']:
+            if result['completion_time'][j] is not None:
+                self.avgctime += result['completion_time'][j]
+                self.lavgctime[ind] += result['completion_time'][j]
+
+        # Optimality gap against the critical-path/worker-load bound, for fully completed samples only.
+        sample['lower_bound'] = combo_lower_bound(graphs if graphs is not None else sample_graphs(sample))
+        if flag and result['completion_time'] and sample['lower_bound'] > 0:
+            sample['bound_gap'] = max(result['completion_time'].values()) / sample['lower_bound'] - 1
+            self.bound_gap += sample['bound_gap']
+            self.bound_cnt += 1
+            self.lbound_gap[ind] += sample['bound_gap']
+            self.lbound_cnt[ind] += 1
+
+    def scores(self):
+        return {
+            "fully_completed_samples": self.fullcnt,
+            "fully_completed_samples_percentage": self.fullcnt / self.total_samples if self.total_samples > 0 else 0,
+            "completed_tasks": self.cnt,
+            "completed_tasks_percentage": self.cnt / self.pcnt if self.pcnt > 0 else 0,
+            "avg_progress": self.prog / self.pcnt if self.pcnt > 0 else 0,
+            "avg_completion_time": self.avgctime / self.cnt if self.cnt > 0 else 0,
+            "avg_progress_speed": self.avgpspeed[0] / self.avgpspeed[1] if self.avgpspeed[1] > 0 else 0,
+            "tasks_with_idle_violation" : self.cnt_idle_violated,
+            "tasks_with_dependency_violation" : self.cnt_dependency_violated,
+            "avg_bound_gap": self.bound_gap / self.bound_cnt if self.bound_cnt > 0 else 0,
+            "total_tasks": self.pcnt,
+            "total_samples": self.total_samples,
+            "cost": self.tcost,
+        }
+
+    def detailed_scores(self):
+        detailed_scores = []
+        for i in range(3):
+            a={}
+            a["fully_completed_samples"] = self.lfullcnt[i]
+            a["completed_tasks"] = self.lcnt[i]
+            a["avg_progress"] = self.lprog[i] / self.lpcnt[i] if self.lpcnt[i] > 0 else 0
+            a["avg_completion_time"] = self.lavgctime[i] / self.lcnt[i] if self.lcnt[i] > 0 else 0
+            a["avg_progress_speed"] = self.lavgpspeed[i][0] / self.lavgpspeed[i][1] if self.lavgpspeed[i][1] > 0 else 0
+            a["tasks_with_idle_violation"] = self.lcnt_idle_violated[i]
+            a["tasks_with_dependency_violation"] = self.lcnt_dependency_violated[i]
+            a["avg_bound_gap"] = self.lbound_gap[i] / self.lbound_cnt[i] if self.lbound_cnt[i] > 0 else 0
+            a["#tasks"] = i+1
+            a["total_tasks"] = self.lpcnt[i]
+
+            detailed_scores.append(a)
+        return detailed_scores
+
+
+def sample_feedback(sample, llm_config_list=None, llm_feedback_flag=False):
+    """
+    The detailed_feedback entry of a sample added to a FeedbackAccumulator, or None if it has no evaluation.
+    """
+    if "plan" not in sample or "eval" not in sample:
+        return None
+    b = {}
+    b["id"] = sample["id"]
+    b["query"] = sample["query"]
+    b["plan"] = sample["plan"]
+    b["detailed_evaluation"] = sample["eval"]
+    if "lower_bound" in sample:
+        b["lower_bound"] = sample["lower_bound"]
+        b["bound_gap"] = sample.get("bound_gap")
+
+    if llm_feedback_flag==True:
+        from agent_utils import get_llm_feedback
+        llm_feedback, feedback_cost = get_llm_feedback(b["query"], b["plan"], b["detailed_evaluation"]["final_results"], llm_config_list)
+        b["llm_feedback"] = llm_feedback
+        b["feedback_cost"] = feedback_cost
+    return b
+
+
+# return scores, detailed scores, detailed feedback
+# cumulative # divided # idx query plan - detailed_evaluation
+# workers > 1 evaluates the plans across a process pool; the aggregation stays serial and in order.
+# cache_dir keeps evaluation results on disk, so reruns only evaluate new or changed plans.
+# Samples without a dependency_graph refer to their tasks by name, resolved through algorithm/dependency_registry.py.
+def timearena_feedback(set_type: str, plans: list, indices: list, llm_config_list: list = None, llm_feedback_flag = False, workers: int = 1, cache_dir: str = None):
+    # Shallow copies are enough: only the 'eval' key is added to each sample.
+    data = [dict(sample) for sample in plans]
+    planned = [i for i in range(len(data)) if "plan" in data[i]]
+    cache = EvaluationCache(cache_dir) if cache_dir else None
+    outcomes, graphs = evaluate_samples([data[i] for i in planned], workers=workers, cache=cache)
+    outcomes = dict(zip(planned, outcomes))
+    graphs = dict(zip(planned, graphs))
+    if cache is not None:
+        print(f"Evaluation cache: {cache.hits} hits, {cache.misses} misses")
+        cache.close()
+    accumulator = FeedbackAccumulator()
+    for i in range(len(data)):
+        accumulator.add(data[i], outcomes.get(i), i, graphs.get(i))
+    detailed_feedback = []
     for i in range(len(data)):
-        if "plan" in data[i]:
-            if "eval" in data[i]:
-                b = {}
-                b["id"] = data[i]["id"]
-                b["query"] = data[i]["query"]
-                b["plan"] = data[i]["plan"]
-                b["detailed_evaluation"] = data[i]["eval"]
-
-                if llm_feedback_flag==True:
-                    from agent_utils import get_llm_feedback
-                    llm_feedback, feedback_cost = get_llm_feedback(b["query"], b["plan"], b["detailed_evaluation"]["final_results"], llm_config_list)
-                    b["llm_feedback"] = llm_feedback
-                    b["feedback_cost"] = feedback_cost
-
-                ret["detailed_feedback"].append(b)
-    return ret["scores"], ret["detailed_scores"], ret["detailed_feedback"]
+        b = sample_feedback(data[i], llm_config_list, llm_feedback_flag)
+        if b is not None:
+            detailed_feedback.append(b)
+    return accumulator.scores(), accumulator.detailed_scores(), detailed_feedback
+
+
+def read_jsonl(path):
+    with open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+# Streaming variant of timearena_feedback for JSONL prediction files: samples are read, evaluated in batches of
+# batch_size and written out one by one, so memory stays flat however many samples there are or how long their
+# transcripts get. Each output line is the detailed_feedback entry of one evaluated sample; returns scores, detailed scores.
+def timearena_feedback_stream(input_path: str, output_path: str, llm_config_list: list = None, llm_feedback_flag = False, workers: int = 1, cache_dir: str = None, batch_size: int = 256):
+    from tqdm import tqdm
+    cache = EvaluationCache(cache_dir) if cache_dir else None
+    accumulator = FeedbackAccumulator()
+    samples = read_jsonl(input_path)
+    index = 0
+    with open(output_path, "w") as out, tqdm() as progress:
+        while True:
+            batch = list(itertools.islice(samples, batch_size))
+            if not batch:
+                break
+            planned = [sample for sample in batch if "plan" in sample]
+            outcomes, graphs = evaluate_samples(planned, workers=workers, cache=cache, progress=False)
+            resolved = iter(zip(outcomes, graphs))
+            for sample in batch:
+                outcome, sample_graph = next(resolved) if "plan" in sample else (None, None)
+                accumulator.add(sample, outcome, index, sample_graph)
+                b = sample_feedback(sample, llm_config_list, llm_feedback_flag)
+                if b is not None:
+                    out.write(json.dumps(b, ensure_ascii=False) + "\n")
+                index += 1
+            out.flush()
+            progress.update(len(batch))
+    if cache is not None:
+        print(f"Evaluation cache: {cache.hits} hits, {cache.misses} misses")
+        cache.close()
+    return accumulator.scores(), accumulator.detailed_scores()
         
 
-# Example usage:
-if __name__ == "__main__":
-    tasks = {
-        "cooking1": [
-            {
-                "wash dish": 3,
-                "pick rice": 2,
-                "pick beef": 2,
-                "cook rice in pot*": 4,
-                "add rice to dish": 2,
-                "chop beef": 3,
-                "fry beef in fryer*": 5,
-                "add beef to dish": 2
-            },
-            {
-                "cook rice in pot*": ["pick rice"],
-                "add rice to dish": ["cook rice in pot*", "wash dish"],
-                "chop beef": ["pick beef"],
-                "fry beef in fryer*": ["chop beef"],
-                "add beef to dish": ["fry beef in fryer*", "wash dish"]
-            }
-        ],
-        "cooking2": [
-            {
-                "wash dish": 3,
-                "pick noodle": 1,
-                "cook noodle in pot*": 5,
-                "add noodle to dish": 2,
-                "pick mushroom": 2,
-                "chop mushroom": 3,
-                "fry mushroom in fryer*": 2,
-                "add mushroom to dish": 2,
-                "pick shrimp": 1,
-                "chop shrimp": 2,
-                "fry shrimp in fryer*": 4,
-                "add shrimp to dish": 2
-            },
-            {
-                "cook noodle in pot*": ["pick noodle"],
-                "add noodle to dish": ["cook noodle in pot*", "wash dish"],
-                "chop mushroom": ["pick mushroom"],
-                "fry mushroom in fryer*": ["chop mushroom"],
-                "add mushroom to dish": ["fry mushroom in fryer*", "wash dish"],
-                "chop shrimp": ["pick shrimp"],
-                "fry shrimp in fryer*": ["chop shrimp"],
-                "add shrimp to dish": ["fry shrimp in fryer*", "wash dish"]
-            }
-        ]
-    }
-    
-    # A sample plan that now must supply separate occurrences for shared subtasks.
-    plan = [
-        "0: pick rice",
-            "1: wait",
-            "2: cook rice in pot",
-            "3: wash dish",
-            "4: wait",
-            "5: wait",
-            "6: add rice to dish",
-            "7: wait",
-            "8: pick beef",
-            "9: wait",
-            "10: chop beef",
-            "11: wait",
-            "12: wait",
-            "13: fry beef in fryer",
-            "14: wash dish",
-            "15: wait",
-            "16: wait",
-            "17: wait",
-            "18: add beef to dish",
-            "19: wait",
-            "20: pick noodle",
-            "21: cook noodle in pot",
-            "22: wait",
-            "23: wait",
-            "24: wait",
-            "25: wait",
-            "26: add noodle to dish",
-            "27: wait",
-            "28: pick mushroom",
-            "29: wait",
-            "30: chop mushroom",
-            "31: wait",
-            "32: wait",
-            "33: fry mushroom in fryer",
-            "34: wait",
-            "35: add mushroom to dish",
-            "36: wait",
-            "37: pick shrimp",
-            "38: chop shrimp",
-            "39: wait",
-            "40: fry shrimp in fryer",
-            "41: wait",
-            "42: wait",
-            "43: wait",
-            "44: add shrimp to dish",
-            "45: wait"        # A second "wash dish" occurrence for the second task.
+# Example tasks and plan, also used as a fixed workload by benchmark.py.
+EXAMPLE_TASKS = {
+    "cooking1": [
+        {
+            "wash dish": 3,
+            "pick rice": 2,
+            "pick beef": 2,
+            "cook rice in pot*": 4,
+            "add rice to dish": 2,
+            "chop beef": 3,
+            "fry beef in fryer*": 5,
+            "add beef to dish": 2
+        },
+        {
+            "cook rice in pot*": ["pick rice"],
+            "add rice to dish": ["cook rice in pot*", "wash dish"],
+            "chop beef": ["pick beef"],
+            "fry beef in fryer*": ["chop beef"],
+            "add beef to dish": ["fry beef in fryer*", "wash dish"]
+        }
+    ],
+    "cooking2": [
+        {
+            "wash dish": 3,
+            "pick noodle": 1,
+            "cook noodle in pot*": 5,
+            "add noodle to dish": 2,
+            "pick mushroom": 2,
+            "chop mushroom": 3,
+            "fry mushroom in fryer*": 2,
+            "add mushroom to dish": 2,
+            "pick shrimp": 1,
+            "chop shrimp": 2,
+            "fry shrimp in fryer*": 4,
+            "add shrimp to dish": 2
+        },
+        {
+            "cook noodle in pot*": ["pick noodle"],
+            "add noodle to dish": ["cook noodle in pot*", "wash dish"],
+            "chop mushroom": ["pick mushroom"],
+            "fry mushroom in fryer*": ["chop mushroom"],
+            "add mushroom to dish": ["fry mushroom in fryer*", "wash dish"],
+            "chop shrimp": ["pick shrimp"],
+            "fry shrimp in fryer*": ["chop shrimp"],
+            "add shrimp to dish": ["fry shrimp in fryer*", "wash dish"]
+        }
     ]
-    
-    result = evaluate_plan(tasks, plan)
+}
+
+# A sample plan that now must supply separate occurrences for shared subtasks.
+EXAMPLE_PLAN = [
+    "0: pick rice",
+    "1: wait",
+    "2: cook rice in pot",
+    "3: wash dish",
+    "4: wait",
+    "5: wait",
+    "6: add rice to dish",
+    "7: wait",
+    "8: pick beef",
+    "9: wait",
+    "10: chop beef",
+    "11: wait",
+    "12: wait",
+    "13: fry beef in fryer",
+    "14: wash dish",
+    "15: wait",
+    "16: wait",
+    "17: wait",
+    "18: add beef to dish",
+    "19: wait",
+    "20: pick noodle",
+    "21: cook noodle in pot",
+    "22: wait",
+    "23: wait",
+    "24: wait",
+    "25: wait",
+    "26: add noodle to dish",
+    "27: wait",
+    "28: pick mushroom",
+    "29: wait",
+    "30: chop mushroom",
+    "31: wait",
+    "32: wait",
+    "33: fry mushroom in fryer",
+    "34: wait",
+    "35: add mushroom to dish",
+    "36: wait",
+    "37: pick shrimp",
+    "38: chop shrimp",
+    "39: wait",
+    "40: fry shrimp in fryer",
+    "41: wait",
+    "42: wait",
+    "43: wait",
+    "44: add shrimp to dish",
+    "45: wait"        # A second "wash dish" occurrence for the second task.
+]
+
+
+# Example usage: without arguments the example plan is evaluated, with --predictions a JSONL file is scored in streaming mode.
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--predictions", type=str, help='JSONL file with one prediction per line')
+    parser.add_argument("--output", type=str, help='JSONL file for the per-sample feedback (default: <predictions>_scored.jsonl)')
+    parser.add_argument("--workers", type=int, default=1, help='processes evaluating plans')
+    parser.add_argument("--cache_dir", type=str, default=None, help='on-disk cache of evaluation results')
+    args = parser.parse_args()
     import pprint
-    pprint.pprint(result)
+    if args.predictions:
+        output = args.output or os.path.splitext(args.predictions)[0] + "_scored.jsonl"
+        if os.path.realpath(output) == os.path.realpath(args.predictions):
+            parser.error(f"--output {output} would overwrite the predictions being scored")
+        scores, detailed_scores = timearena_feedback_stream(args.predictions, output, workers=args.workers, cache_dir=args.cache_dir)
+        pprint.pprint({"scores": scores, "detailed_scores": detailed_scores})
+    else:
+        result = evaluate_plan(EXAMPLE_TASKS, EXAMPLE_PLAN)
+        pprint.pprint(result)
@@ -3,12 +3,16 @@ import os
 
 import copy
 import json
+import contextlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import argparse
 
 from TimeArena import *
 from EvalArena import *
 from agent_utils import *
+from trace_index import TraceIndex
 
 import re
 
@@ -69,6 +73,11 @@ def RunData(args):
     filename = "val.json"
     NUM_SAMPLES = 2 # Number of positive or negative samples to use for training
     reasoning_file = "Code/TimeArenaStatic/reasoning_traces/zeroshot_with_reasontrace/deepseek-reasoner/train/predictions.json"
+    eval_cache_dir = "Outputs/TimeArena/eval_cache"
+    meta_cache_dir = "Outputs/TimeArena/meta_agent_cache" # Meta-agent replies by content hash, reused while the prompts, traces and model match
+    # Traces of each verdict retrieved per query by embedding similarity; None uses the first NUM_SAMPLES for all
+    RETRIEVAL_K = None
+    trace_index_path = "Outputs/TimeArena/trace_index/deepseek-reasoner_train" # Embeddings of the reasoning file's queries, used with RETRIEVAL_K
     # TODO ENDS
 
     filter_dict = {"model": [model]}
@@ -123,38 +132,76 @@ def RunData(args):
         })
     
         
-    training_inputs_outputs = ""
-    zidx = 1
-    for t_dict in correct_predictions[:NUM_SAMPLES]:
-        training_inputs_outputs += f"SAMPLE INPUT #{zidx}:\n{t_dict['query']}\nSAMPLE REASONING TRACE #{zidx}:\n{t_dict['reasoning_content']}\nVERDICT: Correct\n\n"
-        zidx += 1
-
-    for t_dict in wrong_predictions[:NUM_SAMPLES]:
-        training_inputs_outputs += f"SAMPLE INPUT #{zidx}:\n{t_dict['query']}\nSAMPLE REASONING TRACE #{zidx}:\n{t_dict['reasoning_content']}\nVERDICT: Incorrect\n\n"
-        zidx += 1
-
-    building_task = f"""
-    TASK DESCRIPTION: {task}\n
-    OUTPUT FORMAT: {output_format}\n
-    {training_inputs_outputs}
-    """
-
+    # Requests in flight per model, shared by all queries (--max_inflight model=N); other models are not limited.
+    inflight = {model_name: threading.Semaphore(cap) for model_name, cap in args.max_inflight}
 
-    pattern_recognizer = get_agent(llm_config_list, PATTERN_RECOGNIZER_SYSTEM_PROMPT, "pattern-recognizer")
-    rule_extractor = get_agent(llm_config_list, RULE_EXTRACTOR_SYSTEM_PROMPT, "rule-extractor")
-    self_corrector = get_agent(llm_config_list, SELF_CORRECTOR_SYSTEM_PROMPT, "self-corrector")
+    def generate(agent, model_name, content):
+        with inflight.get(model_name, contextlib.nullcontext()):
+            return agent.generate_reply(messages=[{"content": content, "role": "user"}])
 
-    pattern_recognizer_prompt = PATTERN_RECOGNIZER_PROMPT.replace("<<<sample_input_reasoning_trace>>>", building_task)
-    pattern_recognizer_reply = pattern_recognizer.generate_reply(messages=[{"content": pattern_recognizer_prompt, "role": "user"}])
-    print("[PATTERN RECOGNIZER REPLY]:", pattern_recognizer_reply)
+    def meta_generate(agent, content):
+        return generate(agent, model, content)
 
-    self_corrector_prompt = SELF_CORRECTOR_PROMPT.replace("<<<sample_input_reasoning_trace>>>", building_task)
-    self_corrector_reply = self_corrector.generate_reply(messages=[{"content": self_corrector_prompt, "role": "user"}])
-    print("[SELF CORRECTOR REPLY]:", self_corrector_reply)
+    def meta_analysis(building_task):
+        """
+        Runs the meta agents over building_task. Returns their replies and the agents, which are created per call so
+        that meta analyses can run in threads.
+        """
+        pattern_recognizer = get_agent(llm_config_list, PATTERN_RECOGNIZER_SYSTEM_PROMPT, "pattern-recognizer")
+        rule_extractor = get_agent(llm_config_list, RULE_EXTRACTOR_SYSTEM_PROMPT, "rule-extractor")
+        self_corrector = get_agent(llm_config_list, SELF_CORRECTOR_SYSTEM_PROMPT, "self-corrector")
+
+        # The self corrector only reads building_task, so it runs in the background while the rule extractor waits on the
+        # pattern recognizer.
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            self_corrector_prompt = SELF_CORRECTOR_PROMPT.replace("<<<sample_input_reasoning_trace>>>", building_task)
+            self_corrector_future = pool.submit(cached_reply, self_corrector, self_corrector_prompt, meta_cache_dir, meta_generate)
+
+            pattern_recognizer_prompt = PATTERN_RECOGNIZER_PROMPT.replace("<<<sample_input_reasoning_trace>>>", building_task)
+            pattern_recognizer_reply = cached_reply(pattern_recognizer, pattern_recognizer_prompt, meta_cache_dir, meta_generate)
+            print("[PATTERN RECOGNIZER REPLY]:", pattern_recognizer_reply)
+
+            rule_extractor_prompt = RULE_EXTRACTOR_PROMPT.replace("<<<identified_research_patterns>>>", pattern_recognizer_reply)
+            rule_extractor_reply = cached_reply(rule_extractor, rule_extractor_prompt, meta_cache_dir, meta_generate)
+
+            self_corrector_reply = self_corrector_future.result()
+        print("[SELF CORRECTOR REPLY]:", self_corrector_reply)
+        print("[RULE EXTRACTOR REPLY]:", rule_extractor_reply)
+
+        replies = {
+            "pattern_recognizer": pattern_recognizer_reply,
+            "rule_extractor": rule_extractor_reply,
+            "self_corrector": self_corrector_reply,
+        }
+        return replies, [pattern_recognizer, rule_extractor, self_corrector]
 
-    rule_extractor_prompt = RULE_EXTRACTOR_PROMPT.replace("<<<identified_research_patterns>>>", pattern_recognizer_reply)
-    rule_extractor_reply = rule_extractor.generate_reply(messages=[{"content": rule_extractor_prompt, "role": "user"}])
-    print("[RULE EXTRACTOR REPLY]:", rule_extractor_reply)
+    if RETRIEVAL_K is None:
+        agent_replies, meta_agents = meta_analysis(get_building_task(correct_predictions[:NUM_SAMPLES], wrong_predictions[:NUM_SAMPLES]))
+        trace_index = None
+    else:
+        # Queries with the same neighbours, in any order, share one meta analysis.
+        agent_replies = None
+        trace_index = TraceIndex(correct_predictions + wrong_predictions, trace_index_path)
+        correct_positions = range(len(correct_predictions))
+        wrong_positions = range(len(correct_predictions), len(correct_predictions) + len(wrong_predictions))
+        analyses = {}
+        analysis_locks = {}
+        analyses_lock = threading.Lock()
+
+    def neighbour_analysis(query):
+        """
+        The meta analysis of the traces retrieved for query, with their ids. Done once per distinct set of traces.
+        """
+        correct = trace_index.search(query, RETRIEVAL_K, correct_positions)
+        wrong = trace_index.search(query, RETRIEVAL_K, wrong_positions)
+        ids = [t_dict["id"] for t_dict in correct + wrong]
+        key = tuple(sorted(ids))
+        with analyses_lock:
+            lock = analysis_locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in analyses:
+                analyses[key] = meta_analysis(get_building_task(correct, wrong))
+        return analyses[key], ids
 
 
     planner = get_agent(llm_config_list, "You are a Planner Expert.", "planner")
@@ -169,10 +216,10 @@ def RunData(args):
     """
 
 
-    for idx, content in enumerate(data_contents):
-        print(f"Processing task {idx}: ", content["tasks"])
-        
-        idx = content["id"]
+    def run_query(content, planner, refiner):
+        """
+        Plans and refines one query. Returns the keys to add to its content, so that queries can run in threads.
+        """
         query = content["query"]
         print("Query: ", query)
 
@@ -180,6 +227,13 @@ def RunData(args):
             "query": query
         }
 
+        result = {}
+        if trace_index is None:
+            replies, agents = agent_replies, meta_agents
+        else:
+            (replies, agents), result["retrieved_traces"] = neighbour_analysis(query)
+            result["agent_replies"] = replies
+
         sample_outputs = ""
         if len(input_output_pairs) > 0:
             for index, ipop in enumerate(input_output_pairs):
@@ -191,28 +245,28 @@ def RunData(args):
         planner_prefix_variables = f"""
         ###TASK DESCRIPTION: {task}\n
         ###OUTPUT FORMAT: {output_format}\n
-        ###IDENTIFIED REASONING PATTERNS: {pattern_recognizer_reply}\n
-        ###HEURISTICS: {rule_extractor_reply}\n"""
+        ###IDENTIFIED REASONING PATTERNS: {replies["pattern_recognizer"]}\n
+        ###HEURISTICS: {replies["rule_extractor"]}\n"""
 
-        planner_output = planner.generate_reply(messages=[{"content": planner_prefix_prompt + planner_prefix_variables + formatter_prompt + sample_outputs + convert_to_text(input_variables) + "\n OUTPUT:", "role": "user"}])
+        planner_output = generate(planner, model, planner_prefix_prompt + planner_prefix_variables + formatter_prompt + sample_outputs + convert_to_text(input_variables) + "\n OUTPUT:")
 
         print("[PLANNER EXPERT REPLY]:", planner_output)
 
         refiner_prefix_variables = f"""
         ###PLANNER EXPERT REPLY: {planner_output}\n
-        ###SELF-CORRECTION INSIGHTS: {self_corrector_reply}\n
+        ###SELF-CORRECTION INSIGHTS: {replies["self_corrector"]}\n
         """
 
-        refiner_output = refiner.generate_reply(messages=[{"content": refiner_prefix_prompt + refiner_prefix_variables +formatter_prompt + sample_outputs + convert_to_text(input_variables) + "\n OUTPUT:", "role": "user"}])
+        refiner_output = generate(refiner, model2, refiner_prefix_prompt + refiner_prefix_variables +formatter_prompt + sample_outputs + convert_to_text(input_variables) + "\n OUTPUT:")
 
         print("[REFINER EXPERT REPLY]:", refiner_output)
 
-        content["prompts"] = {
+        result["prompts"] = {
             "planner_prompt": planner_prefix_prompt + planner_prefix_variables + "<<<convert_to_text(input_variables)>>>" + "\n OUTPUT:",
             "refiner_prompt": refiner_prefix_prompt + refiner_prefix_variables + "<<<convert_to_text(input_variables)>>>" + "\n OUTPUT:"
         }
         
-        content["intermediate_outputs"] = {
+        result["intermediate_outputs"] = {
             "planner": planner_output,
             "refiner": refiner_output
         }
@@ -220,44 +274,87 @@ def RunData(args):
         final_output = refiner_output
         final_plan = postprocess(final_output)
 
-        cost_summary = autogen.gather_usage_summary([planner, refiner, pattern_recognizer, rule_extractor, self_corrector])
+        cost_summary = autogen.gather_usage_summary([planner, refiner] + agents)
         print("USAGE COST: ", cost_summary)
 
         print("Final Plan: ", final_output)
 
 
-        content["plan"] = final_plan
+        result["plan"] = final_plan
     
-        content["cost_summary"] = cost_summary
+        result["cost_summary"] = cost_summary
+        return result
 
+    def save():
         my_dict = {
             "task": task,
             "output_format": output_format,
             "output_folder_path": save_folder,
             "predictions": data_contents,
-            "agent_replies": {
-                "pattern_recognizer": pattern_recognizer_reply,
-                "rule_extractor": rule_extractor_reply,
-                "self_corrector": self_corrector_reply,
-            }
         }
+        # With RETRIEVAL_K, the replies are kept per prediction instead.
+        if agent_replies is not None:
+            my_dict["agent_replies"] = agent_replies
 
         # Save the output to a json file
         with open(os.path.join(save_folder, filename), "w") as file:
             json.dump(my_dict, file, indent=4)
 
 
-        ("##############################################")
-    
+    checkpoint = checkpoint_path(save_path)
+    restored = restore_checkpoint(checkpoint, data_contents)
+    if restored:
+        print(f"{restored} queries restored from {checkpoint}")
+
+    # A failed query is logged and left without a plan; the others are still planned and saved, and a rerun retries it.
+    failures = []
+    if args.concurrency <= 1:
+        for idx, content in enumerate(data_contents):
+            if "plan" in content:
+                print("Plan already exists for index: ", idx)
+                continue
+            print(f"Processing task {idx}: ", content["tasks"])
+            
+            try:
+                content.update(run_query(content, planner, refiner))
+            except Exception as e:
+                print(f"Query {idx} failed: {e!r}")
+                failures.append(idx)
+                continue
+            append_checkpoint(checkpoint, idx, content)
+
+
+            ("##############################################")
     else:
-        print("Plan already exists for index: ", idx)
+        # Each query gets its own planner and refiner: autogen agents keep usage counters per client, which are
+        # not safe to share across threads. Results go back to their position in data_contents as they finish,
+        # so the final predictions keep the order of the data file whatever order the log has.
+        def run_query_with_own_agents(content):
+            print(f"Processing task {content['id']}: ", content["tasks"])
+            return run_query(content, get_agent(llm_config_list, "You are a Planner Expert.", "planner"), get_agent(llm_config_list2, "You are a Refiner Expert.", "refiner"))
+
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            futures = {pool.submit(run_query_with_own_agents, content): i for i, content in enumerate(data_contents) if "plan" not in content}
+            for future in as_completed(futures):
+                idx = futures[future]
+                try:
+                    data_contents[idx].update(future.result())
+                except Exception as e:
+                    print(f"Query {idx} failed: {e!r}")
+                    failures.append(idx)
+                    continue
+                append_checkpoint(checkpoint, idx, data_contents[idx])
+    save()
+    if failures:
+        raise RuntimeError(f"{len(failures)} queries failed, rerun to retry them: {sorted(failures)}")
+    clear_checkpoint(checkpoint)
 
     #EVALUATION
     with open(os.path.join(save_folder, filename), "r") as file:
         data = json.load(file)
 
     if "scores" not in data:
-        scores, detailed_scores, detailed_feedback = timearena_feedback(set_type=None, plans=data["predictions"], indices=None, llm_config_list=llm_config_list, llm_feedback_flag=False)
+        scores, detailed_scores, detailed_feedback = timearena_feedback(set_type=None, plans=data["predictions"], indices=None, llm_config_list=llm_config_list, llm_feedback_flag=False, cache_dir=eval_cache_dir)
         with open(save_path.replace(".json", "_scored.json"), "w") as file:
             data["scores"] = scores
             data["detailed_scores"] = detailed_scores
@@ -267,6 +364,25 @@ def RunData(args):
         print("Scores already exists")   
 
 
+def get_building_task(correct, wrong):
+    training_inputs_outputs = ""
+    zidx = 1
+    for t_dict in correct:
+        training_inputs_outputs += f"SAMPLE INPUT #{zidx}:\n{t_dict['query']}\nSAMPLE REASONING TRACE #{zidx}:\n{t_dict['reasoning_content']}\nVERDICT: Correct\n\n"
+        zidx += 1
+
+    for t_dict in wrong:
+        training_inputs_outputs += f"SAMPLE INPUT #{zidx}:\n{t_dict['query']}\nSAMPLE REASONING TRACE #{zidx}:\n{t_dict['reasoning_content']}\nVERDICT: Incorrect\n\n"
+        zidx += 1
+
+    building_task = f"""
+    TASK DESCRIPTION: {task}\n
+    OUTPUT FORMAT: {output_format}\n
+    {training_inputs_outputs}
+    """
+    return building_task
+
+
 def postprocess(reply):
     try:
         answer_contents = re.findall(r'<ANSWER>(.*?)</ANSWER>', reply, flags=re.DOTALL)
@@ -277,8 +393,15 @@ def postprocess(reply):
         return reply 
 
 
+def model_cap(string):
+    model_name, cap = string.rsplit('=', 1)
+    return model_name, int(cap)
+
+
 def parse():
     parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=1, help='queries planned at the same time, one at a time by default')
+    parser.add_argument("--max_inflight", type=model_cap, nargs='*', default=[], help='per-model limits on requests in flight, e.g. deepseek-reasoner=4')
     return parser.parse_args()
 
 
@@ -6,6 +6,7 @@ from autogen import ConversableAgent
 from autogen import gather_usage_summary
 
 from EvalArena import *
+from agent_utils import checkpoint_path, append_checkpoint, restore_checkpoint, clear_checkpoint
 
 import os
 import re
@@ -88,6 +89,7 @@ if __name__ == "__main__":
     save_folder = "Outputs/TimeArena/" + strategy_name + "/" + model
     input_file_path = "Data/TimeArena"
     filename = "val.json"
+    eval_cache_dir = "Outputs/TimeArena/eval_cache"
     # TODO ENDS
 
     save_path = os.path.join(save_folder, filename)
@@ -110,6 +112,10 @@ if __name__ == "__main__":
         data_contents = data["predictions"]
     else:
         data_contents = read_json(os.path.join(input_file_path, filename))
+    checkpoint = checkpoint_path(save_path)
+    restored = restore_checkpoint(checkpoint, data_contents)
+    if restored:
+        print(f"{restored} samples restored from {checkpoint}")
 
     for idx, content in enumerate(data_contents):
         if "plan" in content:
@@ -118,7 +124,6 @@ if __name__ == "__main__":
 
         print(f"Processing task {idx}: ", content["tasks"])
 
-        idx = content["id"]
         query = content["query"]
         print("Query: ", query)
 
@@ -172,27 +177,28 @@ if __name__ == "__main__":
         content["debate_rounds"] = agent_contexts
         content["plan_selector_reply"] = plan_selector_reply
 
+        append_checkpoint(checkpoint, idx, content)
 
-        my_dict = {
-            "task": task,
-            "output_format": output_format,
-            "output_folder_path": save_folder,
-            "predictions": data_contents,
-        }
+        # response_dict[question] = (agent_contexts, answer)
 
-        # Save the output to a json file
-        with open(save_path, "w") as file:
-            json.dump(my_dict, file, indent=4)
-        
+    my_dict = {
+        "task": task,
+        "output_format": output_format,
+        "output_folder_path": save_folder,
+        "predictions": data_contents,
+    }
 
-        # response_dict[question] = (agent_contexts, answer)
+    # Save the output to a json file
+    with open(save_path, "w") as file:
+        json.dump(my_dict, file, indent=4)
+    clear_checkpoint(checkpoint)
 
     #EVALUATION
     with open(save_path, "r") as file:
         data = json.load(file)
 
     if "scores" not in data:
-        scores, detailed_scores, detailed_feedback = timearena_feedback(set_type=None, plans=data["predictions"], indices=None, llm_config_list=llm_config_list, llm_feedback_flag=False)
+        scores, detailed_scores, detailed_feedback = timearena_feedback(set_type=None, plans=data["predictions"], indices=None, llm_config_list=llm_config_list, llm_feedback_flag=False, cache_dir=eval_cache_dir)
         with open(save_path.replace(".json", "_scored.json"), "w") as file:
             data["scores"] = scores
             data["detailed_scores"] = detailed_scores
@@ -3,4 +3,8 @@ from .specificTasks import *
 from .goals import *
 from .object import *
 from .actions import *
-from .calling import *
\ No newline at end of file
+from .calling import *
+from .compiled import *
+from .vec_env import *
+from .events import *
+from .registry import *
\ No newline at end of file
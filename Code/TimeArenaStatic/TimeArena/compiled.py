@@ -0,0 +1,132 @@
+from collections.abc import MutableMapping
+import numpy as np
+
+
+class TodoView(MutableMapping):
+    """
+    Dict-like view of one object's todo counters inside a CompiledCombo, installed as properties['todo'] so code
+    that reads or writes the todo dict keeps working while the counters live in a single array.
+    """
+    __slots__ = ("combo", "slots")
+
+    def __init__(self, combo, slots):
+        self.combo = combo
+        self.slots = slots
+
+    def __getitem__(self, key):
+        return int(self.combo.todo[self.slots[key]])
+
+    def __setitem__(self, key, value):
+        self.combo.set(self.slots[key], value)
+
+    def __delitem__(self, key):
+        raise TypeError("todo entries cannot be removed from a compiled task combination")
+
+    def __contains__(self, key):
+        return key in self.slots
+
+    def __iter__(self):
+        return iter(self.slots)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class CompiledCombo:
+    """
+    A loaded task combination compiled to integer ids. Every (object, todo entry) pair is a slot:
+    - todo: remaining time per slot (int64 array), initial: the starting values
+    - occupy: per-object occupancy flags (bool array, objects in load order)
+    - passive: slots of second objects ("_2" entries), which have no time of their own
+    - requires: (object name, action) -> bitmask of slots that must be at zero first, or None when the dependency
+      refers to an entry that does not exist (callers then fall back to the dict walk, which raises as before)
+    - done: bitmask of slots currently at zero
+    """
+    def __init__(self, objects):
+        self.slot = {}
+        self.object_slots = []
+        self.object_id = {}
+        values = []
+        for i, obj in enumerate(objects):
+            self.object_id[obj.properties['name']] = i
+            self.object_slots.append({})
+            for k, v in obj.properties['todo'].items():
+                self.slot[(obj.properties['name'], k)] = len(values)
+                self.object_slots[i][k] = len(values)
+                values.append(v)
+        self.todo = np.array(values, dtype=np.int64)
+        self.initial = self.todo.copy()
+        self.occupy = np.array([obj.properties['occupy'] for obj in objects], dtype=bool)
+        self.passive = np.array(["_2" in k for (_, k) in self.slot], dtype=bool)
+        self.requires = {}
+        for obj in objects:
+            name = obj.properties['name']
+            for action, dependency in obj.properties['dependency'].items():
+                if type(dependency) == str:
+                    required = [(name, dependency)]
+                elif type(dependency) == dict:
+                    required = list(dependency.items())
+                else:
+                    required = []
+                mask = 0
+                for entry in required:
+                    if entry not in self.slot:
+                        mask = None
+                        break
+                    mask |= 1 << self.slot[entry]
+                self.requires[(name, action)] = mask
+        self.recount_done()
+
+    def recount_done(self):
+        self.done = 0
+        for i in np.flatnonzero(self.todo == 0).tolist():
+            self.done |= 1 << i
+
+    def set(self, i, value):
+        self.todo[i] = value
+        if value == 0:
+            self.done |= 1 << i
+        else:
+            self.done &= ~(1 << i)
+
+    def decrement(self, i):
+        """
+        Decrements slot i and returns its new value.
+        """
+        value = int(self.todo[i]) - 1
+        self.set(i, value)
+        return value
+
+    def ready(self, name, action):
+        """
+        True/False when every prerequisite of the action on the object is (not) done, None if it cannot be decided here.
+        """
+        mask = self.requires.get((name, action), 0)
+        if mask is None:
+            return None
+        return (mask & ~self.done) == 0
+
+    def load(self, todo, occupy):
+        self.todo[:] = todo
+        self.occupy[:] = occupy
+        self.recount_done()
+
+    def attach(self, objects):
+        """
+        Installs TodoViews as the todo dicts of the given objects, which must be in the order this combo was compiled from.
+        """
+        for obj, slots in zip(objects, self.object_slots):
+            obj.properties['todo'] = TodoView(self, slots)
+
+    def copy(self):
+        """
+        Copy with its own state arrays; the id tables and masks are shared.
+        """
+        combo = object.__new__(CompiledCombo)
+        combo.__dict__.update(self.__dict__)
+        combo.todo = self.todo.copy()
+        combo.occupy = self.occupy.copy()
+        return combo
@@ -1,7 +1,14 @@
 from .object import *
-from .specificTasks import *
+from .actions import *
+from .registry import get_task
+from algorithm.dependency_registry import get_graphs
 from .goals import *
+from .compiled import CompiledCombo
+from .events import Event
+import copy
+import itertools
 import json
+import re
 import pdb
 
 
@@ -39,12 +46,14 @@ class TimeAnera():
     def __init__(self):
         pass
     def load(self, tasknames):
-        self.Tasks = [globals()[name]() for name in tasknames]
-        self.taskdescriptions = [i.name for i in self.Tasks]
-        alldependencygraphs = json.load(open("Code/TimeArenaStatic/algorithm/dependencygraph.json"))
-        self.dependencygraphs = {}
-        for task in tasknames:
-            self.dependencygraphs[task] = alldependencygraphs[task]
+        self.Tasks = [get_task(name) for name in tasknames]
+        self.load_graphs([i.name for i in self.Tasks], get_graphs(tasknames))
+    def load_graphs(self, taskdescriptions, dependencygraphs):
+        """
+        Sets up the query for tasks given directly as descriptions and dependency graphs (e.g. synthetic tasks).
+        """
+        self.taskdescriptions = taskdescriptions
+        self.dependencygraphs = dependencygraphs
         self.actions = [i[0] for i in self.dependencygraphs.values()]
     def getInstruction(self):
         instruction = meta_prompt_anera
@@ -85,43 +94,108 @@ class TimeArena():
         self.args = args
         tasks = self.args.taskName
         self.taskName = tasks
-        self.Task = [globals()[name]() for name in self.taskName]
+        self.Task = [get_task(name) for name in self.taskName]
         self.objects, self.name2objects, self.objects_in_task = self.merge_objects(self.Task)
         self.actions, self.name2actions = self.merge_actions(self.Task) 
         self.taskdescription = [i.name for i in self.Task]
         self.total_time = self.getTotalActionTime()
+        self.compiled = CompiledCombo(self.objects)
+        self.compiled.attach(self.objects)
         self.score = score(self.objects, self.total_time) 
         self.actions_state = MetaAction().properties['state']
+        # Validation tables: the valid names never change after load, so actions are checked and parsed once per string.
+        self.action_names = frozenset(self.getActionList())
+        self.object_names = frozenset(self.getObjectList())
+        self.invalid_action_message = self.getInvalidActionMessage()
+        self.invalid_object_message = self.getInvalidObjectMessage()
+        self.validity = {}
+        self.parsed_actions = {}
+        self.object_aliases = {}
+        for name in self.getObjectList():
+            self.object_aliases.setdefault(re.sub(r"_\d+$", "", name), []).append(name)
+
+
+    def snapshot(self):
+        """
+        Captures the mutable simulator state as a flat tuple: todo counters in slot order, object occupancy,
+        the pending non-occupying actions and the score/bookkeeping fields. Pass it to restore() to rewind.
+        """
+        return (
+            tuple(self.compiled.todo.tolist()),
+            tuple(self.compiled.occupy.tolist()),
+            tuple((name, tuple(props)) for name, props in self.non_occupy.items()),
+            tuple((name, tuple(info.items())) for name, info in self.non_occupy_conversation_info.items()),
+            self.last_action,
+            self.last_score,
+            self.current_score,
+            self.isCompleted,
+            getattr(self, 'agent_occupy', False),
+            self.score.completed,
+        )
+
+
+    def restore(self, token):
+        """
+        Rewinds the simulator to a state returned by snapshot() on this environment or one forked from it.
+        """
+        todo, occupy, non_occupy, non_occupy_info, self.last_action, self.last_score, self.current_score, self.isCompleted, self.agent_occupy, self.score.completed = token
+        self.compiled.load(todo, occupy)
+        for obj, v in zip(self.objects, occupy):
+            obj.properties['occupy'] = v
+        self.non_occupy = {name: list(props) for name, props in non_occupy}
+        self.non_occupy_conversation_info = {name: dict(info) for name, info in non_occupy_info}
+
+
+    def fork(self):
+        """
+        Returns an independent environment in the same state. Only the objects and the compiled state arrays are
+        copied; task definitions, actions and the dependency tables are shared with this environment.
+        """
+        env = copy.copy(self)
+        forked = {}
+        for obj in self.objects:
+            new_obj = MetaObject(obj.properties['name'], None, obj.properties['dependency'])
+            new_obj.properties['occupy'] = obj.properties['occupy']
+            forked[obj] = new_obj
+        env.objects = [forked[obj] for obj in self.objects]
+        env.name2objects = {name: forked[obj] for name, obj in self.name2objects.items()}
+        env.objects_in_task = {task: [forked[obj] for obj in objs] for task, objs in self.objects_in_task.items()}
+        env.compiled = self.compiled.copy()
+        env.compiled.attach(env.objects)
+        env.task_num = dict(self.task_num)
+        env.score = copy.copy(self.score)
+        env.score.objects = env.objects
+        env.score.initial = {forked[obj]: initial for obj, initial in self.score.initial.items()}
+        env.restore(self.snapshot())
+        return env
         
-    def step(self, action: str):
+    def step(self, action: str, structured=False):
+        """
+        Takes one action for the current minute. With structured=True the observation is the list of Event records
+        for the minute instead of text; render() turns such a list into the text returned by default.
+        """
         increment = 0 
         action = action.strip()
         if action == 'wait':
-            increment = 0
-            observation = "You wait for one minute.\n"
+            events = [Event("waited")]
             self.update_non_occupy() 
-            observation += self.add_non_occupy_complete_to_obervation() 
+            events += self.settle_non_occupy()
             self.current_score = self.score.get_score()
             if self.current_score == 100:
                 self.isCompleted = True
             increment = self.current_score - self.last_score
             self.last_score = self.current_score
             self.last_action = action
-            return observation, increment, self.isCompleted, False, False
+            return self.observe(events, structured), increment, self.isCompleted, False, False
         
         action_valid, object_valid = self.is_valid(action)
         if not (action_valid and object_valid):
-            observation = ""
-            increment = 0
+            events = []
             if not action_valid:
-                invalid_action_message = self.getInvalidActionMessage()
-                observation += invalid_action_message
-                print(invalid_action_message)
+                events.append(Event("invalid_action", action))
             if not object_valid:
-                invalid_object_message = self.getInvalidObjectMessage()
-                observation += invalid_object_message
-                print(invalid_object_message)
-            return observation, increment, False, False, True
+                events.append(Event("invalid_object", action))
+            return self.observe(events, structured), increment, False, False, True
 
 
         
@@ -132,38 +206,23 @@ class TimeArena():
                 if not self.already_complete(object_attribute):
                     if self.name2actions[action_parsed].properties['occupy']: 
                         if action == self.last_action: 
-                            observation = None 
-                            increment = 0
                             self.reduce_time(object_attribute)
                             required_time = self.get_time(object_attribute) 
                             self.update_non_occupy() 
                             if required_time == 0:
-                                for k,v in object_attribute.items():
-                                    if "_2" not in v:
-                                        observation = f"{k} is {self.actions_state[v][1]}.\n"
-                                self.current_score = self.score.get_score()
-                                if self.current_score == 100:
-                                    self.isCompleted = True
-                                increment = self.current_score - self.last_score
+                                events = self.completion_events(object_attribute)
                                 self.agent_occupy = False
-                                observation += self.add_non_occupy_complete_to_obervation() 
+                                events += self.settle_non_occupy()
+                            else:
+                                events = [Event("continued", action, minutes=required_time)]
                         else:
                             required_time = self.get_time(object_attribute)
                             self.reduce_time(object_attribute)
-                            observation = f"You are doing ``{action}``, it will take {required_time} minutes.\n"
-                            increment = 0
+                            events = [Event("started", action, minutes=required_time)]
                             self.update_non_occupy()
-                            observation += self.add_non_occupy_complete_to_obervation()
-                            required_time = self.get_time(object_attribute)
-                            if required_time == 0:
-                                for k,v in object_attribute.items():
-                                    if "_2" not in v:
-                                        observation += f"{k} is {self.actions_state[v][1]}.\n"
-                                self.current_score = self.score.get_score()
-                                if self.current_score == 100:
-                                    self.isCompleted = True
-                                increment = self.current_score - self.last_score
-                                
+                            events += self.settle_non_occupy()
+                            if self.get_time(object_attribute) == 0:
+                                events += self.completion_events(object_attribute)
                                 self.agent_occupy = False
                         self.current_score = self.score.get_score()
                         if self.current_score == 100:
@@ -171,76 +230,322 @@ class TimeArena():
                         increment = self.current_score - self.last_score
                         self.last_action = action
                         self.last_score = self.current_score
-                        return observation, increment, self.isCompleted, self.agent_occupy, False
+                        return self.observe(events, structured), increment, self.isCompleted, self.agent_occupy, False
                     else:
                         self.add_non_occupy_info(action, object_attribute)
                         self.non_occupy = self.merge(self.non_occupy, object_attribute)
                         required_time = self.get_time(object_attribute)
-                        observation = f"You are doing ``{action}``, it will take {required_time} minutes.\n"
+                        events = [Event("started", action, minutes=required_time)]
                         self.update_non_occupy()
-                        observation += self.add_non_occupy_complete_to_obervation()
+                        events += self.settle_non_occupy()
                         self.current_score = self.score.get_score()
                         if self.current_score == 100:
                             self.isCompleted = True
                         increment = self.current_score - self.last_score
                         self.last_score = self.current_score
                         self.last_action = action
-                        return observation, increment, self.isCompleted, self.agent_occupy, False
+                        return self.observe(events, structured), increment, self.isCompleted, self.agent_occupy, False
                 else:
-                    observation = f"``{action}`` has already been completed.\n"
-                    increment = 0
+                    events = [Event("already_completed", action)]
                     self.update_non_occupy()
-                    observation += self.add_non_occupy_complete_to_obervation()
+                    events += self.settle_non_occupy()
                     self.current_score = self.score.get_score()
                     if self.current_score == 100:
                         self.isCompleted = True
                     increment = self.current_score - self.last_score
                     self.last_score = self.current_score
-                    return observation, increment, self.isCompleted, False, True
+                    return self.observe(events, structured), increment, self.isCompleted, False, True
             else:
-                for k, v in object_attribute.items():
-                    if v in self.name2objects[k].properties['dependency'].keys():
-                        if type(self.name2objects[k].properties['dependency'][v]) == str:
-                            if not self.name2objects[k].properties['todo'][self.name2objects[k].properties['dependency'][v]] == 0:
-                                observation = f"You cannot perform action ``{action_parsed}`` on object ``{self.name2objects[k].properties['name']}``.\n"
-                                observation += "Because {0} is {1}.".format(k,self.actions_state[self.name2objects[k].properties['dependency'][v]][0])
-                        elif type(self.name2objects[k].properties['dependency'][v]) == dict:
-                            observation = f"You cannot perform action ``{action_parsed}`` on object ``{self.name2objects[k].properties['name']}``.\n"
-                            for a,b in self.name2objects[k].properties['dependency'][v].items():
-                                if not self.name2objects[a].properties['todo'][b] == 0:
-                                    observation += "Because {0} is {1}.".format(a,self.actions_state[b][0])
-                                    break
+                events = self.blocked_events(action_parsed, object_attribute)
                 self.update_non_occupy()
-                observation += self.add_non_occupy_complete_to_obervation()
+                events += self.settle_non_occupy()
                 self.current_score = self.score.get_score()
                 if self.current_score == 100:
                     self.isCompleted = True
                 increment = self.current_score - self.last_score
                 self.last_score = self.current_score
-                return observation, increment, self.isCompleted, False, True
+                return self.observe(events, structured), increment, self.isCompleted, False, True
         else:
-            for k, v in object_attribute.items():
-                if self.name2objects[k].properties['occupy']:
-                    observation = f"Object ``{k}`` is being occupied by another action.\n"
-                    increment = 0
-                if v not in self.name2objects[k].properties['todo'].keys():
-                    observation = f"You cannot perform action ``{action_parsed}`` on object ``{self.name2objects[k].properties['name']}``.\n"
-                    increment = 0
-                elif len(action.split(" ")) == 4:
-                    obj1,obj2 = action.split(" ")[1],action.split(" ")[3]
-                    if obj2 in self.constraint_only_for_task_dict.keys():
-                        if obj1 not in self.constraint_only_for_task_dict[obj2]:
-                            observation = f"You cannot perform action ``{action_parsed}`` on object ``{obj1}`` and ``{obj2}``.\n"
-                            increment = 0
+            events = self.unavailable_events(action, action_parsed, object_attribute)
             self.update_non_occupy()
-            observation += self.add_non_occupy_complete_to_obervation()
+            events += self.settle_non_occupy()
             self.current_score = self.score.get_score()
             if self.current_score == 100:
                 self.isCompleted = True
-            return observation, increment, self.isCompleted, False, True
+            return self.observe(events, structured), increment, self.isCompleted, False, True
+
+
+    def running_action(self):
+        """
+        The occupying action in progress (the last action, repeated minute after minute), or None.
+        """
+        if self.last_action in ('', 'wait'):
+            return None
+        action_parsed, object_attribute = self.parse_action(self.last_action)
+        if not self.name2actions[action_parsed].properties['occupy'] or self.get_time(object_attribute) <= 0:
+            return None
+        return self.last_action
+
+
+    def advance(self, until=None, structured=True):
+        """
+        Lets simulated time run, repeating the running occupying action or waiting otherwise, up to and including the
+        next minute in which an in-flight action finishes, or for at most `until` minutes. The minutes before it are
+        applied in one go, which is equivalent to stepping them one by one since nothing completes in them.
+        Returns (events, increment, isCompleted, agent_occupy, minutes) with the events of the last minute; a stretch of
+        waiting is reported as a single waited event carrying its length.
+        """
+        action = self.running_action() or 'wait'
+        slots = [self.compiled.slot[(name, prop)] for name, props in self.non_occupy.items() for prop in props]
+        remaining = [v for v in self.compiled.todo[slots].tolist() if v > 0]
+        if any(v == 0 and not self.compiled.passive[i] for i, v in zip(slots, self.compiled.todo[slots].tolist())):
+            # A completion is waiting to be reported, which the next step does.
+            remaining.append(1)
+        if action != 'wait':
+            object_attribute = self.parse_action(action)[1]
+            running = [self.compiled.slot[item] for item in object_attribute.items()]
+            running = [i for i in running if not self.compiled.passive[i]]
+            remaining.append(self.get_time(object_attribute))
+        if until is not None:
+            remaining.append(until)
+        if not remaining or min(remaining) <= 0:
+            return ([] if structured else None), 0, self.isCompleted, False, 0
+        minutes = min(remaining)
+        increment = 0
+        if minutes > 1:
+            skip = minutes - 1
+            ticking = [i for i in slots if self.compiled.todo[i] > 0]
+            if action != 'wait':
+                ticking += running
+            self.compiled.todo[ticking] -= skip
+            self.current_score = self.score.get_score()
+            if self.current_score == 100:
+                self.isCompleted = True
+            increment = self.current_score - self.last_score
+            self.last_score = self.current_score
+            self.last_action = action
+        events, step_increment, isCompleted, agent_occupy, _ = self.step(action, structured=True)
+        if action == 'wait' and minutes > 1:
+            events = [Event("waited", minutes=minutes)] + events[1:]
+        return self.observe(events, structured), increment + step_increment, isCompleted, agent_occupy, minutes
+
+
+    def run_until_event(self, structured=True):
+        """
+        advance() without a time limit: returns at the next completion of an in-flight action.
+        """
+        return self.advance(None, structured)
+
+
+    def resolve_action(self, action):
+        """
+        Maps an action written with task-level object names, as in static plans (e.g. "fry shrimp in fryer"), to the
+        names of this environment, where objects sharing a name carry _1/_2 suffixes. The running occupying action wins,
+        then the first candidate that can start now, then the first one that is at least allowed for its objects.
+        """
+        action = action.strip().rstrip('*').strip().lower()
+        parts = action.split(" ")
+        if len(parts) not in [2, 4]:
+            return action
+        positions = [1, 3] if len(parts) == 4 else [1]
+        options = [self.object_aliases.get(parts[p], [parts[p]]) for p in positions]
+        candidates = []
+        for names in itertools.product(*options):
+            for p, name in zip(positions, names):
+                parts[p] = name
+            candidates.append(" ".join(parts))
+        running = self.running_action()
+        if running in candidates:
+            return running
+        fallback = candidates[0]
+        for candidate in candidates:
+            if self.is_valid(candidate) != (True, True):
+                continue
+            _, object_attribute = self.parse_action(candidate)
+            if not self.action_object_valid(object_attribute, candidate):
+                continue
+            if self.subtask_denpendency(object_attribute) and not self.already_complete(object_attribute):
+                return candidate
+            if fallback == candidates[0]:
+                fallback = candidate
+        return fallback
+
+
+    def replay(self, plan_lines):
+        """
+        Runs a static plan ("t: action" lines) through a fork of this environment, without rendering text, and returns
+        a trajectory summary. A 'wait' while an occupying action is running continues that action, and stretches of
+        waiting are advanced in one go. The simulator takes one action per minute, so further actions listed for the
+        same minute are reported as skipped; missing minutes count as waiting.
+        Returns a dict with:
+          - progress: the score after each minute
+          - completion_time: minutes until the score reached 100, or None
+          - score: the final score
+          - rejected: (minute, action, event kind) for actions that were invalid, blocked or otherwise not started
+          - skipped: (minute, action) for extra actions in a minute
+          - interrupted: (minute, action, minutes left) for occupying actions cut off by the action started at that
+            minute, which evaluate_plan reports as an error
+        """
+        env = self.fork()
+        plan = {}
+        for line in plan_lines:
+            time_str, action = line.split(":", 1)
+            plan.setdefault(int(time_str.strip()), []).append(action.strip())
+        end = max(plan) + 1 if plan else 0
+        progress = []
+        rejected = []
+        skipped = []
+        interrupted = []
+        completion_time = None
+        t = 0
+        while t < end:
+            actions = plan.get(t, ['wait'])
+            skipped += [(t, action) for action in actions[1:]]
+            if actions[0].lower() == 'wait':
+                stretch = 1
+                while t + stretch < end and plan.get(t + stretch, ['wait'])[0].lower() == 'wait':
+                    skipped += [(t + stretch, action) for action in plan.get(t + stretch, [])[1:]]
+                    stretch += 1
+                elapsed = 0
+                while elapsed < stretch:
+                    before = env.score.get_score()
+                    _, _, done, _, minutes = env.advance(stretch - elapsed)
+                    progress += [before] * (minutes - 1) + [env.score.get_score()]
+                    elapsed += minutes
+                    if done and completion_time is None:
+                        completion_time = t + elapsed
+                t += stretch
+            else:
+                action = env.resolve_action(actions[0])
+                running = env.running_action()
+                left = env.get_time(env.parse_action(running)[1]) if running else 0
+                events, _, done, _, _ = env.step(action, structured=True)
+                for event in events:
+                    if event.kind in ["invalid_action", "invalid_object", "already_completed", "blocked", "occupied", "unavailable"]:
+                        rejected.append((t, action, event.kind))
+                        break
+                else:
+                    if running and action != running:
+                        interrupted.append((t, running, left))
+                progress.append(env.score.get_score())
+                t += 1
+                if done and completion_time is None:
+                    completion_time = t
+        # Actions still running after the last plan line finish on their own, as in evaluate_plan. Nothing in flight
+        # lasts longer than the longest action of the combination, which bounds the waiting.
+        limit = t + int(env.compiled.initial.max()) if len(env.compiled.initial) else t
+        while t < limit:
+            before = env.score.get_score()
+            _, _, done, _, minutes = env.run_until_event()
+            if minutes == 0:
+                break
+            progress += [before] * (minutes - 1) + [env.score.get_score()]
+            t += minutes
+            if done and completion_time is None:
+                completion_time = t
+        return {
+            "progress": progress,
+            "completion_time": completion_time,
+            "score": env.score.get_score(),
+            "rejected": rejected,
+            "skipped": skipped,
+            "interrupted": interrupted,
+        }
+
+
+    def completion_events(self, object_attribute):
+        return [Event("completed", object=k, state=self.actions_state[v][1]) for k, v in object_attribute.items() if "_2" not in v]
+
+
+    def blocked_events(self, action_parsed, object_attribute):
+        # Only the last unmet prerequisite is reported, as in the text observation.
+        event = None
+        for k, v in object_attribute.items():
+            dependency = self.name2objects[k].properties['dependency']
+            if v in dependency.keys():
+                if type(dependency[v]) == str:
+                    if not self.name2objects[k].properties['todo'][dependency[v]] == 0:
+                        event = Event("blocked", action_parsed, k, self.actions_state[dependency[v]][0], other=k)
+                elif type(dependency[v]) == dict:
+                    event = Event("blocked", action_parsed, k)
+                    for a,b in dependency[v].items():
+                        if not self.name2objects[a].properties['todo'][b] == 0:
+                            event = Event("blocked", action_parsed, k, self.actions_state[b][0], other=a)
+                            break
+        return [event] if event else []
+
+
+    def unavailable_events(self, action, action_parsed, object_attribute):
+        event = None
+        for k, v in object_attribute.items():
+            if self.name2objects[k].properties['occupy']:
+                event = Event("occupied", object=k)
+            if v not in self.name2objects[k].properties['todo'].keys():
+                event = Event("unavailable", action_parsed, k)
+            elif len(action.split(" ")) == 4:
+                obj1,obj2 = action.split(" ")[1],action.split(" ")[3]
+                if obj2 in self.constraint_only_for_task_dict.keys():
+                    if obj1 not in self.constraint_only_for_task_dict[obj2]:
+                        event = Event("unavailable", action_parsed, obj1, other=obj2)
+        return [event] if event else []
+
+
+    def observe(self, events, structured):
+        return events if structured else self.render(events)
+
+
+    def render(self, events):
+        """
+        Text observation for the events of one minute. A minute in which an occupying action only continues renders as None.
+        """
+        if events and all(event.kind == "continued" for event in events):
+            return None
+        observation = ""
+        completed = set()
+        for event in events:
+            if event.kind == "waited":
+                if event.minutes and event.minutes > 1:
+                    observation += f"You wait for {event.minutes} minutes.\n"
+                else:
+                    observation += "You wait for one minute.\n"
+            elif event.kind == "invalid_action":
+                observation += self.invalid_action_message
+            elif event.kind == "invalid_object":
+                observation += self.invalid_object_message
+            elif event.kind == "started":
+                observation += f"You are doing ``{event.action}``, it will take {event.minutes} minutes.\n"
+            elif event.kind == "completed":
+                line = f"{event.object} is {event.state}.\n"
+                if line not in completed:
+                    completed.add(line)
+                    observation += line
+            elif event.kind == "already_completed":
+                observation += f"``{event.action}`` has already been completed.\n"
+            elif event.kind == "blocked":
+                observation += f"You cannot perform action ``{event.action}`` on object ``{event.object}``.\n"
+                if event.other is not None:
+                    observation += "Because {0} is {1}.".format(event.other, event.state)
+            elif event.kind == "occupied":
+                observation += f"Object ``{event.object}`` is being occupied by another action.\n"
+            elif event.kind == "unavailable":
+                if event.other is None:
+                    observation += f"You cannot perform action ``{event.action}`` on object ``{event.object}``.\n"
+                else:
+                    observation += f"You cannot perform action ``{event.action}`` on object ``{event.object}`` and ``{event.other}``.\n"
+        return observation
 
 
     def subtask_denpendency(self, object_attribute):
+        for k, v in object_attribute.items():
+            ready = self.compiled.ready(k, v)
+            if ready is None:
+                return self.subtask_denpendency_walk(object_attribute)
+            if not ready:
+                return False
+        return True
+
+
+    def subtask_denpendency_walk(self, object_attribute):
         for k, v in object_attribute.items():
             if v in self.name2objects[k].properties['dependency'].keys():
                 if type(self.name2objects[k].properties['dependency'][v]) == str: 
@@ -377,6 +682,16 @@ class TimeArena():
 
 
     def parse_action(self, action):
+        """
+        Returns (action_parsed, object_attribute) for an action string, cached per string. The returned dict is shared
+        and must not be modified.
+        """
+        if action not in self.parsed_actions:
+            self.parsed_actions[action] = self.split_action(action)
+        return self.parsed_actions[action]
+
+
+    def split_action(self, action):
         action_parts = action.split(" ")
         parsed_action_dict = {}
         if len(action_parts) > 2:
@@ -392,10 +707,9 @@ class TimeArena():
     def action_object_valid(self, object_attribute, action):
         action_parts = action.split(" ")
         for object_name, action_required in object_attribute.items():
-            associated_object = self.name2objects[object_name]
-            if associated_object.properties['occupy']:
+            if self.compiled.occupy[self.compiled.object_id[object_name]]:
                 return False
-            if action_required not in associated_object.properties['todo']:
+            if (object_name, action_required) not in self.compiled.slot:
                 return False
             if len(action_parts) == 4:
                 subject, object_ = action_parts[1], action_parts[3]
@@ -407,27 +721,32 @@ class TimeArena():
 
     def already_complete(self, object_attribute):
         for k, v in object_attribute.items():
-            if "_2" not in v and self.name2objects[k].properties['todo'][v] == 0:
+            i = self.compiled.slot[(k, v)]
+            if not self.compiled.passive[i] and self.compiled.todo[i] == 0:
                 return True
         return False
 
 
     def get_time(self, object_attribute):
         key = next(iter(object_attribute))
-        return self.name2objects[key].properties['todo'][object_attribute[key]]
+        return int(self.compiled.todo[self.compiled.slot[(key, object_attribute[key])]])
 
 
     def reduce_time(self, object_attributes):
         for object_name, attribute_value in object_attributes.items():
-            if "_2" not in attribute_value:
-                self.name2objects[object_name].properties['todo'][attribute_value] -= 1
+            i = self.compiled.slot[(object_name, attribute_value)]
+            if not self.compiled.passive[i]:
+                if self.compiled.decrement(i) == 0:
+                    self.score.complete(self.name2objects[object_name], attribute_value)
 
 
     def update_non_occupy(self):
         for object_name, indices in self.non_occupy.items():
             for index in indices:
-                if self.name2objects[object_name].properties['todo'][index] > 0:
-                    self.name2objects[object_name].properties['todo'][index] -= 1
+                i = self.compiled.slot[(object_name, index)]
+                if self.compiled.todo[i] > 0:
+                    if self.compiled.decrement(i) == 0:
+                        self.score.complete(self.name2objects[object_name], index)
 
 
     def add_non_occupy_info(self, action, object_attribute):
@@ -449,10 +768,16 @@ class TimeArena():
                 obj.properties['occupy'] = True
             else:
                 obj.properties['occupy'] = False
+        self.compiled.occupy[:] = [obj.properties['occupy'] for obj in self.objects]
 
     def add_non_occupy_complete_to_obervation(self):
-        object_set = set()
-        object_string = ""
+        return self.render(self.settle_non_occupy())
+
+    def settle_non_occupy(self):
+        """
+        Drops finished non-occupying actions from the pending list, frees their objects and returns their completed events.
+        """
+        events = []
         updated_occupy = {}
         updated_occupy_info = {}
         for object, property_list in self.non_occupy.items():
@@ -463,7 +788,7 @@ class TimeArena():
                     updated_occupy_info.setdefault(object, {})
                     updated_occupy_info[object][property] = self.non_occupy_conversation_info[object][property]
                 elif self.name2objects[object].properties['todo'][property] == 0 and "_2" not in property:
-                    object_set.add(f"{object} is {self.actions_state[property][1]}.")
+                    events.append(Event("completed", object=object, state=self.actions_state[property][1]))
                 elif self.name2objects[object].properties['todo'][property] == 0 and "_2" in property:
                     act = self.non_occupy_conversation_info[object][property]
                     if act.split(" ")[1] in updated_occupy_info.keys():
@@ -471,12 +796,10 @@ class TimeArena():
                         updated_occupy[object].append(property)
                         updated_occupy_info.setdefault(object, {})
                         updated_occupy_info[object][property] = self.non_occupy_conversation_info[object][property]
-        for obj in object_set:
-            object_string += f"{obj}\n"
         self.non_occupy = updated_occupy
         self.non_occupy_conversation_info = updated_occupy_info
         self.update_object_occupy()
-        return object_string
+        return events
 
 
     def getTaskDescription(self,Task):
@@ -563,6 +886,11 @@ class TimeArena():
         return [obj.properties['name'].lower() for obj in self.objects]
 
     def is_valid(self, action):
+        if action not in self.validity:
+            self.validity[action] = self.check_action(action)
+        return self.validity[action]
+
+    def check_action(self, action):
         action = action.strip().lower()
         split_action = action.split(" ")
         if action == 'wait':
@@ -573,9 +901,9 @@ class TimeArena():
             action_parsed = f"{split_action[0]} {split_action[2]}"
         else:
             action_parsed = f"{split_action[0]}"
-        if action_parsed not in self.getActionList():
+        if action_parsed not in self.action_names:
             return False, True
-        objects = self.getObjectList()
+        objects = self.object_names
         if len(split_action) == 4:
             if split_action[1] not in objects or split_action[3] not in objects:
                 return True, False
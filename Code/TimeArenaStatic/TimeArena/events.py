@@ -0,0 +1,14 @@
+from collections import namedtuple
+
+
+# What happened in one TimeArena minute, as returned by TimeArena.step(..., structured=True). Kinds:
+# - waited: the agent waited
+# - invalid_action / invalid_object: the action or one of its objects does not exist (action)
+# - started: an action was initiated and takes `minutes` (action, minutes)
+# - continued: an occupying action is still running with `minutes` left (action, minutes)
+# - completed: `object` reached `state` (object, state)
+# - already_completed: the action had been done before (action)
+# - blocked: a prerequisite is missing; `other` is still in `state` when known (action, object, other, state)
+# - occupied: `object` is in use by another action (object)
+# - unavailable: the action does not apply to `object`, or to the pair `object`/`other` (action, object, other)
+Event = namedtuple("Event", ["kind", "action", "object", "state", "minutes", "other"], defaults=(None,) * 5)
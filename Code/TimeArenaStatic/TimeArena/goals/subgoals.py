@@ -9,15 +9,30 @@ class score:
         self.objects = objects
         self.total_time = totaltime
         self.initial = self.total_initial()
+        self.completed = self.recount()
 
 
-    def get_score(self):
-        current_score = 0
+    def complete(self, obj, k):
+        """
+        Called when todo entry k of obj reaches zero, so get_score never has to walk the objects.
+        """
+        self.completed += self.initial[obj][k]
+
+
+    def recount(self):
+        """
+        Completed duration from a full walk of the todo dicts, for when they are set directly (e.g. on restore).
+        """
+        self.completed = 0
         for obj in self.objects:
             for k, v in obj.properties['todo'].items():
                 if v == 0:
-                    current_score += self.initial[obj][k]
-        return int(current_score * 100 / self.total_time)
+                    self.completed += self.initial[obj][k]
+        return self.completed
+
+
+    def get_score(self):
+        return int(self.completed * 100 / self.total_time)
 
 
     def total_initial(self):
@@ -0,0 +1,78 @@
+import functools
+import hashlib
+import json
+import os
+import pickle
+from .object import MetaObject
+from .actions import MetaAction
+
+
+TASKS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tasks.json")
+
+
+class Task():
+    """
+    One compiled task of the registry. The data is kept as tuples so the compiled form can be shared by every
+    episode: add_actions() returns the task's MetaActions (read-only, shared), add_objects() returns fresh
+    MetaObjects, since loading renames objects and rewrites their dependencies.
+    """
+    __slots__ = ("key", "name", "actions", "objects")
+
+    def __init__(self, key, name, actions, objects):
+        self.key = key
+        self.name = name
+        self.actions = tuple(MetaAction(action, usage, occupy) for action, usage, occupy in actions)
+        self.objects = tuple(
+            (obj, tuple(todo.items()), tuple((k, v if type(v) == str else tuple(v.items())) for k, v in dependency.items()))
+            for obj, todo, dependency in objects
+        )
+
+    def add_actions(self):
+        return list(self.actions)
+
+    def add_objects(self):
+        return [
+            MetaObject(obj, dict(todo), {k: v if type(v) == str else dict(v) for k, v in dependency})
+            for obj, todo, dependency in self.objects
+        ]
+
+
+def compile_tasks(path=TASKS_FILE):
+    """
+    Compiles the task definitions of a tasks.json file into {task key: Task}.
+    """
+    with open(path) as f:
+        definitions = json.load(f)
+    return {key: Task(key, task['name'], task['actions'], task['objects']) for key, task in definitions.items()}
+
+
+@functools.lru_cache(maxsize=None)
+def load_registry(path=TASKS_FILE, cache=None):
+    """
+    Compiled tasks of the given tasks.json, built once per process. With cache, the compiled registry is also
+    pickled to that file and reused by later processes as long as the fingerprint of tasks.json matches.
+    """
+    if cache is None:
+        return compile_tasks(path)
+    with open(path, 'rb') as f:
+        fingerprint = hashlib.sha1(f.read()).hexdigest()
+    if os.path.exists(cache):
+        with open(cache, 'rb') as f:
+            stored = pickle.load(f)
+        if stored['fingerprint'] == fingerprint:
+            return stored['tasks']
+    tasks = compile_tasks(path)
+    with open(cache, 'wb') as f:
+        pickle.dump({'fingerprint': fingerprint, 'tasks': tasks}, f)
+    return tasks
+
+
+def get_task(key):
+    """
+    The compiled task with the given key (e.g. "cooking1"). Set TIMEARENA_TASK_CACHE to a file path to keep the
+    compiled registry pickled on disk.
+    """
+    tasks = load_registry(cache=os.environ.get("TIMEARENA_TASK_CACHE"))
+    if key not in tasks:
+        raise KeyError(f"Unknown task {key}, valid tasks are: {', '.join(tasks)}")
+    return tasks[key]
@@ -0,0 +1,94 @@
+import argparse
+import numpy as np
+from .environment import TimeArena
+from .events import Event
+
+
+class VecEnv():
+    """
+    N TimeArena episodes, possibly with different task combos, stepped together. The compiled todo counters of all
+    episodes live in one padded (N x max slots) array, with each episode's CompiledCombo.todo being a view of its row,
+    so every episode that waits in a minute is advanced by a single array update. Other actions go through
+    TimeArena.step of their episode.
+    """
+    def __init__(self):
+        self.envs = []
+
+    def load(self, task_combos, constraint=False):
+        self.envs = []
+        for tasks in task_combos:
+            env = TimeArena()
+            env.load(argparse.Namespace(taskName=list(tasks), constraint=constraint))
+            self.envs.append(env)
+        width = max(len(env.compiled.todo) for env in self.envs)
+        self.todo = np.zeros((len(self.envs), width), dtype=np.int64)
+        # Padding slots stay at zero, are never active and are worth nothing.
+        self.weight = np.zeros((len(self.envs), width), dtype=np.int64)
+        self.passive = np.zeros((len(self.envs), width), dtype=bool)
+        self.active = np.zeros((len(self.envs), width), dtype=bool)
+        for i, env in enumerate(self.envs):
+            size = len(env.compiled.todo)
+            self.todo[i, :size] = env.compiled.todo
+            env.compiled.todo = self.todo[i, :size]
+            self.weight[i, :size] = env.compiled.initial
+            self.passive[i, :size] = env.compiled.passive
+            self.sync_active(i)
+
+    def __len__(self):
+        return len(self.envs)
+
+    def sync_active(self, i):
+        """
+        Marks the slots of episode i's pending non-occupying actions, which tick down every minute.
+        """
+        env = self.envs[i]
+        self.active[i] = False
+        for name, props in env.non_occupy.items():
+            for prop in props:
+                self.active[i, env.compiled.slot[(name, prop)]] = True
+
+    def step(self, actions, render=None):
+        """
+        Takes one action per episode. render lists the episodes whose observation text is wanted (default: all);
+        the others get None. Returns (observations, rewards, dones), the last two as arrays.
+        """
+        render = range(len(self.envs)) if render is None else render
+        render = set(render)
+        observations = [None] * len(self.envs)
+        rewards = np.zeros(len(self.envs), dtype=np.int64)
+        actions = [action.strip() for action in actions]
+        waiting = [i for i, action in enumerate(actions) if action == 'wait']
+        if waiting:
+            rows = slice(None) if len(waiting) == len(self.envs) else np.array(waiting)
+            ticking = self.active[rows] & (self.todo[rows] > 0)
+            self.todo[rows] -= ticking
+            finished = ticking & (self.todo[rows] == 0)
+            gained = (finished * self.weight[rows]).sum(axis=1)
+            # Completions leave the pending list only in the next observation, which some occupying steps skip.
+            stale = (finished | (self.active[rows] & ~self.passive[rows] & (self.todo[rows] == 0))).any(axis=1)
+            for r, i in enumerate(waiting):
+                env = self.envs[i]
+                events = [Event("waited")]
+                if stale[r]:
+                    env.score.completed += int(gained[r])
+                    for slot in np.flatnonzero(finished[r]).tolist():
+                        env.compiled.done |= 1 << slot
+                    events += env.settle_non_occupy()
+                    self.sync_active(i)
+                env.current_score = env.score.get_score()
+                if env.current_score == 100:
+                    env.isCompleted = True
+                rewards[i] = env.current_score - env.last_score
+                env.last_score = env.current_score
+                env.last_action = 'wait'
+                if i in render:
+                    observations[i] = env.render(events)
+        for i, action in enumerate(actions):
+            if action == 'wait':
+                continue
+            events, rewards[i], _, _, _ = self.envs[i].step(action, structured=True)
+            self.sync_active(i)
+            if i in render:
+                observations[i] = self.envs[i].render(events)
+        dones = np.array([env.isCompleted for env in self.envs], dtype=bool)
+        return observations, rewards, dones
@@ -1,15 +1,20 @@
 import argparse
+import hashlib
 import json
+import os
 import pdb
+import sys
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import itertools
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from algorithm.dependency_registry import load_graphs
 
 def all_permutations(lst):
     return list(itertools.permutations(lst))
 
 
-with open("dependencygraph.json","r") as f:
-    dependencygraph = json.load(f)
+dependencygraph = load_graphs()
 
 
 def comma_separated_strings(string):
@@ -36,16 +41,65 @@ def check_dependencies(action, current_time, action_schedule, dependencies):
         return True
     return all(action_schedule.get(dep, (100, 100))[1] < current_time for dep in dependencies[action])
 
+def critical_path(task):
+    """
+    Length of the longest dependency chain of a task: no schedule can finish before it.
+    """
+    actions = task[0]
+    dependencies = task[1]
+    finish = {}
+    for action in actions:
+        stack = [action]
+        while stack:
+            current = stack[-1]
+            if current in finish:
+                stack.pop()
+                continue
+            parents = [dep for dep in dependencies.get(current, []) if dep in actions and dep not in finish]
+            if parents:
+                stack.extend(parents)
+                continue
+            stack.pop()
+            finish[current] = actions[current] + max((finish[dep] for dep in dependencies.get(current, []) if dep in finish), default=0)
+    return max(finish.values(), default=0)
+
+def worker_load(task):
+    """
+    Time the single worker is busy with occupying actions. Idle ('*') actions are left out, since evaluate_plan lets
+    them start in the same minute as other work.
+    """
+    return sum(duration for action, duration in task[0].items() if "*" not in action)
+
+def lower_bound(task):
+    """
+    Lower bound on the oracle completion time of a task: the critical path or the worker load, whichever is larger.
+    """
+    return max(critical_path(task), worker_load(task))
+
+def combo_lower_bound(tasks):
+    """
+    Lower bound for a task combination given as {task name: [durations, dependencies]} (the 'dependency_graph' of a
+    data sample). Tasks share the worker but not their dependency chains.
+    """
+    if not tasks:
+        return 0
+    return max(max(critical_path(task) for task in tasks.values()), sum(worker_load(task) for task in tasks.values()))
+
+
 def cal_oracle(task):
     actions = task[0]
     dependencies = task[1]
     pre_sorted_actions = sorted((k for k in actions.keys() if "*" in k), key=lambda x: actions[x], reverse=True)
-    all_sorted_actions = all_permutations(pre_sorted_actions)
+    all_sorted_actions = itertools.permutations(pre_sorted_actions)
+    bound = lower_bound(task)
 
     final_min = 100
     final_schedule = {}
 
     for sorted_actions in all_sorted_actions:
+        # Nothing can finish before the lower bound, so an ordering that reaches it is optimal.
+        if final_min <= bound:
+            break
         final_sequence = []
         processed_actions = set()
         for action in sorted_actions:
@@ -75,7 +129,12 @@ def cal_oracle(task):
         occupy_actions = {k: v for k, v in actions.items() if "*" not in k}
         non_occupy_actions = {k: v for k, v in actions.items() if "*" in k}
 
+        pruned = False
         while occupy_actions or non_occupy_actions:
+            # The worker time never exceeds the completion time, so this ordering cannot beat the best one.
+            if current_time >= final_min:
+                pruned = True
+                break
             action_broken = False
             for l in actionlist:
                 for act in l:
@@ -98,6 +157,8 @@ def cal_oracle(task):
                     break
             if not action_broken:
                 current_time += 1
+        if pruned:
+            continue
         maxNum = 0
         for action, times in sorted(action_schedule.items(), key=lambda x: x[1]):
             maxNum = max(maxNum, times[1])
@@ -107,6 +168,74 @@ def cal_oracle(task):
     return final_min, final_schedule
 
 
+def cal_oracle_cpsat(task, time_limit=10.0):
+    """
+    Exact oracle: schedules the task with OR-Tools CP-SAT instead of enumerating permutations.
+
+    Occupying actions hold the single worker for their whole duration, idle ('*') actions hold it for the
+    minute in which they are started and then run in parallel, and every dependency must have finished
+    before its dependent action starts. The makespan is minimized.
+
+    Returns (completion time, schedule, gap) where schedule maps each action to its (start, finish) times in
+    the same format as cal_oracle, and gap is the relative optimality gap (0.0 when the schedule is proven
+    optimal, > 0 when the time limit was hit first).
+    """
+    from ortools.sat.python import cp_model
+
+    actions = task[0]
+    dependencies = task[1]
+    horizon = sum(max(duration, 1) for duration in actions.values()) + max(actions.values())
+
+    model = cp_model.CpModel()
+    starts = {}
+    ends = {}
+    worker = []
+    for n, (action, duration) in enumerate(actions.items()):
+        starts[action] = model.NewIntVar(0, horizon, f"start_{n}")
+        ends[action] = model.NewIntVar(0, horizon, f"end_{n}")
+        model.Add(ends[action] == starts[action] + duration)
+        busy = 1 if "*" in action else duration
+        worker.append(model.NewFixedSizeIntervalVar(starts[action], busy, f"worker_{n}"))
+    model.AddNoOverlap(worker)
+    for action, deps in dependencies.items():
+        for dep in deps:
+            if action in starts and dep in ends:
+                model.Add(starts[action] >= ends[dep])
+    makespan = model.NewIntVar(0, horizon, "makespan")
+    model.AddMaxEquality(makespan, list(ends.values()))
+    model.Add(makespan >= lower_bound(task))
+    model.Minimize(makespan)
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    status = solver.Solve(model)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        raise RuntimeError(f"CP-SAT found no schedule within {time_limit}s (status {solver.StatusName(status)}).")
+
+    final_min = int(solver.Value(makespan))
+    final_schedule = {}
+    for action, duration in actions.items():
+        start = int(solver.Value(starts[action]))
+        final_schedule[action] = (start, start + duration - 1)
+    if status == cp_model.OPTIMAL:
+        gap = 0.0
+    else:
+        bound = solver.BestObjectiveBound()
+        gap = (final_min - bound) / final_min if final_min > 0 else 0.0
+    return final_min, final_schedule, gap
+
+
+def solve_oracle(task, solver="permutation", time_limit=10.0):
+    """
+    Returns (completion time, schedule, gap) for a task using the chosen solver. The permutation
+    search reports no gap (None) since it is a heuristic over the orderings of the idle actions.
+    """
+    if solver == "cpsat":
+        return cal_oracle_cpsat(task, time_limit)
+    final_min, final_schedule = cal_oracle(task)
+    return final_min, final_schedule, None
+
+
 def process_data(data):
     new_data = {}
     num = len(data.keys())
@@ -133,17 +262,92 @@ def process_data(data):
     return final
 
 
-def get_pracle_performance(tasks):
+def get_pracle_performance(tasks, solver="permutation", time_limit=10.0):
     data = {}
     for task in tasks:
         data[task] = dependencygraph[task]
     
     if len(tasks) == 1:
         task_name, task = list(data.items())[0]
-        return task_name, cal_oracle(task)
+        return task_name, solve_oracle(task, solver, time_limit)
     new_data = process_data(data)
     task_name, task = list(new_data.items())[0]
-    return task_name, cal_oracle(task)
+    return task_name, solve_oracle(task, solver, time_limit)
+
+def oracle_key(tasks, solver="permutation"):
+    """
+    Store key of a task combination: the solver plus the sorted task names, so every ordering of a combo shares one entry.
+    """
+    return f"{solver}:{','.join(sorted(tasks))}"
+
+def solve_combo(job):
+    """
+    Solves one task combination in canonical (sorted) order. Module-level so it can run in a worker process.
+    """
+    tasks, solver, time_limit = job
+    task_name, (oracle, schedule, gap) = get_pracle_performance(sorted(tasks), solver, time_limit)
+    return oracle_key(tasks, solver), {"task_name": task_name, "oracle": oracle, "schedule": schedule, "gap": gap, "time_limit": time_limit}
+
+
+class OracleStore:
+    """
+    Oracle results persisted as JSON, keyed by oracle_key. The store is tied to a hash of dependencygraph.json and
+    starts empty when the graph changes. Entries remember the time limit they were solved with, so a result that is
+    not proven optimal is solved again under a larger time limit.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.fingerprint = hashlib.sha256(json.dumps(dependencygraph, sort_keys=True).encode()).hexdigest()
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                stored = json.load(f)
+            if stored.get("dependencygraph") == self.fingerprint:
+                self.entries = stored["entries"]
+
+    def solve(self, combos, solver="permutation", time_limit=10.0, workers=1):
+        """
+        Fills the store for the given task combinations, solving each distinct missing combo once across a process pool.
+        Stored results with an optimality gap are solved again when time_limit exceeds the one they got.
+        Returns the number of combos solved.
+        """
+        jobs = {}
+        for tasks in combos:
+            key = oracle_key(tasks, solver)
+            if key not in jobs and (key not in self.entries or self.improvable(self.entries[key], time_limit)):
+                jobs[key] = (sorted(tasks), solver, time_limit)
+        if not jobs:
+            return 0
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(solve_combo, jobs.values()))
+        else:
+            results = [solve_combo(job) for job in jobs.values()]
+        for key, entry in results:
+            entry["schedule"] = {k: list(v) for k, v in entry["schedule"].items()}
+            previous = self.entries.get(key)
+            if previous is not None and previous["oracle"] < entry["oracle"]:
+                # A longer run is not guaranteed to find the earlier schedule again; keep the better one.
+                previous["time_limit"] = time_limit
+                continue
+            self.entries[key] = entry
+        return len(jobs)
+
+    @staticmethod
+    def improvable(entry, time_limit):
+        # Entries from before time limits were stored count as solved with none.
+        return bool(entry.get("gap")) and time_limit > entry.get("time_limit", 0)
+
+    def get(self, tasks, solver="permutation"):
+        return self.entries[oracle_key(tasks, solver)]
+
+    def save(self):
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        with open(self.path, 'w') as f:
+            json.dump({"dependencygraph": self.fingerprint, "entries": self.entries}, f)
+
 
 def convert_schedule_to_plan(schedule_dict):
     """
@@ -189,36 +393,54 @@ def convert_schedule_to_plan(schedule_dict):
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument("--tasks", nargs='+', type=comma_separated_strings, help='input tasks splited by comma')
-    parser.add_argument("--filename", type=str, help='filename of data file')
+    parser.add_argument("--filename", type=str, nargs='+', help='filename(s) of data files')
     parser.add_argument("--folderpath", type=str, default="../dataset", help='folderpath to data file')
+    parser.add_argument("--solver", type=str, default="permutation", choices=["permutation", "cpsat"], help='permutation search or exact CP-SAT scheduling')
+    parser.add_argument("--time_limit", type=float, default=10.0, help='time limit in seconds per CP-SAT solve')
+    parser.add_argument("--store", type=str, default="../outputs/oracle/oracle_store.json", help='oracle results reused across runs')
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help='processes solving distinct task combinations')
     args = parser.parse_args()
     
     if args.filename:
-        import os
-        filepath = os.path.join(args.folderpath, args.filename)
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        datasets = {}
+        for filename in args.filename:
+            filepath = os.path.join(args.folderpath, filename)
+            with open(filepath, 'r') as f:
+                datasets[filename] = json.load(f)
+        store = OracleStore(args.store)
+        combos = [sample['tasks'] for data in datasets.values() for sample in data]
+        solved = store.solve(combos, args.solver, args.time_limit, args.workers)
+        print(f"Oracle store: {len(set(oracle_key(tasks, args.solver) for tasks in combos))} distinct combos, {solved} solved")
+        if solved:
+            store.save()
+        if not os.path.exists("../outputs/oracle/"):
+            os.makedirs("../outputs/oracle/")
+        for filename, data in datasets.items():
             avg_oracle = 0
             for i in range(len(data)):
-                # for task in data[i]['tasks']:
-                task_name, (oracle, schedule) = get_pracle_performance(data[i]['tasks'])
+                entry = store.get(data[i]['tasks'], args.solver)
+                oracle, gap = entry['oracle'], entry['gap']
                 avg_oracle += oracle
                 d_ = {'Oracle_Completion_Time': oracle, 'Oracle_Completion_Speed': round(100/oracle,2)}
+                if gap is not None:
+                    d_['Oracle_Gap'] = round(gap, 4)
+                    if gap > 0:
+                        print(f"Task: {entry['task_name']} ; time limit hit, optimality gap: {round(gap*100,2)}%")
                 data[i]['oracle'] = d_
-                data[i]['oracle_plan'] = convert_schedule_to_plan(schedule)
+                data[i]['oracle_plan'] = convert_schedule_to_plan(entry['schedule'])
             d = {'Avg_Oracle_Completion_Time': round(avg_oracle/len(data),2), 'Avg_Oracle_Completion_Speed': round(100/round(avg_oracle/len(data),2),2)}
             data.append(d)
-        if not os.path.exists("../outputs/oracle/"):
-            os.makedirs("../outputs/oracle/")
-        resultpath = f"../outputs/oracle/{args.filename}"
-        with open(resultpath, 'w') as f:
-            json.dump(data, f, indent=4)
+            resultpath = f"../outputs/oracle/{filename}"
+            with open(resultpath, 'w') as f:
+                json.dump(data, f, indent=4)
     else:
         avg_oracle = 0
         # print(args.tasks)
         for task in args.tasks:
-            task_name, (oracle, schedule) = get_pracle_performance(task)
+            task_name, (oracle, schedule, gap) = get_pracle_performance(task, args.solver, args.time_limit)
             print(schedule)
             avg_oracle += oracle
             print(f"Task: {task_name} ; Oracle Completion Time: {oracle} ; Oracle Completion Speed: {round(100/oracle,2)}")
+            if gap is not None:
+                print(f"Task: {task_name} ; Optimality Gap: {round(gap*100,2)}%")
         print(f"Avg Oracle Completion Time: {round(avg_oracle/len(args.tasks),2)} ; Avg Oracle Completion Speed: {round(100/round(avg_oracle/len(args.tasks),2),2)}")
\ No newline at end of file
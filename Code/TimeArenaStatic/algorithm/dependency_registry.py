@@ -0,0 +1,48 @@
+import functools
+import json
+import os
+
+GRAPH_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dependencygraph.json")
+
+
+@functools.lru_cache(maxsize=None)
+def load_graphs(path=GRAPH_FILE):
+    """
+    {task name: dependency graph} of a dependencygraph.json file, parsed once per process. The graphs are shared by
+    every caller and must not be modified.
+    """
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def get_graph(task, path=GRAPH_FILE):
+    graphs = load_graphs(path)
+    if task not in graphs:
+        raise KeyError(f"Unknown task {task}, valid tasks are: {', '.join(graphs)}")
+    return graphs[task]
+
+
+def get_graphs(tasks, path=GRAPH_FILE):
+    """
+    Dependency graphs of a task combination by name, in the given task order (which evaluate_plan depends on).
+    """
+    return {task: get_graph(task, path) for task in tasks}
+
+
+def intern_graphs(dependency_graph, path=GRAPH_FILE):
+    """
+    Replaces the graphs of a sample's dependency_graph that equal a registry graph by the shared registry object, so
+    a large predictions file keeps one copy per task instead of one per sample.
+    """
+    graphs = load_graphs(path)
+    return {task: graphs[task] if graphs.get(task) == graph else graph for task, graph in dependency_graph.items()}
+
+
+def sample_graphs(sample, path=GRAPH_FILE):
+    """
+    Dependency graphs of a data or prediction sample. Samples may carry their own dependency_graph, or refer to
+    registry tasks by name through 'tasks' alone.
+    """
+    if sample.get('dependency_graph') is not None:
+        return sample['dependency_graph']
+    return get_graphs(sample['tasks'], path)
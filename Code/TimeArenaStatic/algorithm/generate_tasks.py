@@ -0,0 +1,101 @@
+import argparse
+import json
+import os
+import random
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from TimeArena.environment import TimeAnera
+
+# Actions that occupy the agent, and idle actions (marked with '*' in dependency graphs) that run on their own.
+OCCUPY_VERBS = ["wash", "pick", "chop", "cut", "polish", "wipe", "fold", "label", "mop", "iron", "read", "trim"]
+IDLE_VERBS = ["heat", "activate", "bake", "brew", "cool", "dry", "soak", "crystallize", "dissolve", "dilute"]
+NOUNS = ["cup", "beaker", "shirt", "plate", "sample", "towel", "flask", "pan", "filter", "jar", "tray", "tube"]
+
+
+def generate_task(rng, index, num_actions, depth, width, idle_ratio, duration_range):
+    """
+    One synthetic task in the dependencygraph.json format, [{action: minutes}, {action: [dependencies]}].
+    The actions are spread over `depth` layers of at most `width` actions. Each action after the first layer depends
+    on one action of the layer before it, plus possibly actions of earlier layers. Objects carry the task index so
+    action names never collide inside a combination.
+    """
+    if not 1 <= depth <= num_actions <= depth * width:
+        raise ValueError(f"{num_actions} actions do not fit {depth} layers of width {width}")
+    sizes = [1] * depth
+    for layer in rng.sample([l for l in range(depth) for _ in range(width - 1)], num_actions - depth):
+        sizes[layer] += 1
+    idle = set(rng.sample(range(num_actions), round(num_actions * idle_ratio)))
+    times = {}
+    dependencies = {}
+    layers = []
+    for size in sizes:
+        layer = []
+        for _ in range(size):
+            n = len(times)
+            noun = f"{rng.choice(NOUNS)}{index}_{n}"
+            action = f"{rng.choice(IDLE_VERBS)} {noun}*" if n in idle else f"{rng.choice(OCCUPY_VERBS)} {noun}"
+            times[action] = rng.randint(*duration_range)
+            if layers:
+                required = {rng.choice(layers[-1])}
+                earlier = [a for l in layers for a in l]
+                required.update(rng.sample(earlier, rng.randint(0, min(2, len(earlier)))))
+                dependencies[action] = sorted(required)
+            layer.append(action)
+        layers.append(layer)
+    return [times, dependencies]
+
+
+def generate_tasks(num_tasks, num_actions, depth, width, idle_ratio=0.3, duration_range=(1, 5), seed=0):
+    """
+    {task name: dependency graph} for `num_tasks` synthetic tasks named synthetic1, synthetic2, ...
+    """
+    rng = random.Random(seed)
+    return {
+        f"synthetic{i}": generate_task(rng, i, num_actions, depth, width, idle_ratio, duration_range)
+        for i in range(1, num_tasks + 1)
+    }
+
+
+def generate_combos(graphs, combo_size, num_combos, seed=0):
+    """
+    Samples in the format of Data/TimeArena (id, tasks, query, dependency_graph), each combining `combo_size`
+    distinct tasks of `graphs` with the TimeAnera query for them.
+    """
+    if combo_size > len(graphs):
+        raise ValueError(f"Cannot combine {combo_size} tasks out of {len(graphs)}")
+    rng = random.Random(seed)
+    samples = []
+    for i in range(num_combos):
+        tasks = rng.sample(list(graphs), combo_size)
+        env = TimeAnera()
+        env.load_graphs([f"Complete the {len(graphs[t][0])} steps of {t}." for t in tasks], {t: graphs[t] for t in tasks})
+        query, dependency_graph = env.getDatapoint()
+        samples.append({'id': str(i), 'tasks': tasks, 'query': query, 'dependency_graph': dependency_graph})
+    return samples
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_tasks", type=int, default=100, help='synthetic tasks to generate')
+    parser.add_argument("--num_actions", type=int, default=10, help='actions per task')
+    parser.add_argument("--depth", type=int, default=4, help='layers of the dependency graph of each task')
+    parser.add_argument("--width", type=int, default=4, help='maximum actions per layer')
+    parser.add_argument("--idle_ratio", type=float, default=0.3, help="fraction of idle actions ('*')")
+    parser.add_argument("--min_duration", type=int, default=1, help='shortest action in minutes')
+    parser.add_argument("--max_duration", type=int, default=5, help='longest action in minutes')
+    parser.add_argument("--combo_size", type=int, nargs='+', default=[10], help='tasks per combination, one data file per size')
+    parser.add_argument("--num_combos", type=int, default=10, help='combinations per data file')
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output_dir", type=str, default="../outputs/synthetic/", help='folder for the dependency graphs and data files')
+    args = parser.parse_args()
+
+    graphs = generate_tasks(args.num_tasks, args.num_actions, args.depth, args.width, args.idle_ratio, (args.min_duration, args.max_duration), args.seed)
+    if not os.path.exists(args.output_dir):
+        os.makedirs(args.output_dir)
+    with open(os.path.join(args.output_dir, "dependencygraph.json"), 'w') as f:
+        json.dump(graphs, f, indent=4)
+    for size in args.combo_size:
+        samples = generate_combos(graphs, size, args.num_combos, args.seed + size)
+        with open(os.path.join(args.output_dir, f"synthetic#{size}.json"), 'w') as f:
+            json.dump(samples, f, indent=4)
+        print(f"synthetic#{size}.json: {len(samples)} combinations of {size} tasks")
@@ -0,0 +1,265 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from EvalArena import evaluate_plan, evaluate_job, timearena_feedback, timearena_feedback_stream, EXAMPLE_TASKS, EXAMPLE_PLAN
+from algorithm.cal_oracle import dependencygraph, process_data, solve_oracle
+from algorithm.generate_tasks import generate_tasks, generate_combos
+from TimeArena import TimeArena
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+VAL_FILE = os.path.join(HERE, "..", "..", "Data", "TimeArena", "val.json")
+PREDICTIONS_FILE = os.path.join(HERE, "reasoning_traces", "zeroshot_with_reasontrace", "deepseek-reasoner", "train", "predictions.json")
+
+
+def serial_plan(graphs):
+    """
+    A valid plan for a combination of dependency graphs: one action per minute as soon as its dependencies are
+    done, idle actions first, waiting out occupying actions.
+    """
+    times = {}
+    dependencies = {}
+    for n, (times_, dependencies_) in enumerate(graphs.values()):
+        times.update({(n, a): d for a, d in times_.items()})
+        dependencies.update({(n, a): [(n, b) for b in d] for a, d in dependencies_.items()})
+    finish = {}
+    plan = []
+    t = 0
+    while len(finish) < len(times):
+        ready = [a for a in times if a not in finish and all(finish.get(b, t + 1) <= t for b in dependencies.get(a, []))]
+        if not ready:
+            plan.append(f"{t}: wait")
+            t += 1
+            continue
+        action = min(ready, key=lambda a: not a[1].endswith('*'))
+        finish[action] = t + times[action]
+        plan.append(f"{t}: {action[1].rstrip('*')}")
+        t += 1
+        if not action[1].endswith('*'):
+            for t in range(t, finish[action]):
+                plan.append(f"{t}: wait")
+            t = finish[action]
+    for t in range(t, max(finish.values()) + 1):
+        plan.append(f"{t}: wait")
+    return plan
+
+
+def load_predictions():
+    with open(PREDICTIONS_FILE) as f:
+        return json.load(f)["predictions"]
+
+
+def load_combos():
+    with open(VAL_FILE) as f:
+        return sorted({tuple(sample['tasks']) for sample in json.load(f)})
+
+
+def synthetic(num_tasks, num_actions, depth, width, combo_size):
+    graphs = generate_tasks(num_tasks, num_actions, depth, width, seed=0)
+    sample = generate_combos(graphs, combo_size, 1, seed=0)[0]
+    return sample['dependency_graph'], serial_plan(sample['dependency_graph'])
+
+
+# Each workload returns the calls of one run. It is called again before every run, outside the timing, so calls
+# may share state that has to be fresh (e.g. a loaded environment).
+def evaluate_example():
+    return [lambda: evaluate_plan(EXAMPLE_TASKS, EXAMPLE_PLAN)]
+
+
+def evaluate_predictions():
+    # Some real plans are rejected by parse_plan; evaluate_job reports those like timearena_feedback does.
+    return [lambda p=p: evaluate_job((p['dependency_graph'], p['plan'])) for p in load_predictions()]
+
+
+def evaluate_long():
+    # Few tasks with long dependency chains.
+    graphs, plan = synthetic(5, 60, 30, 2, 5)
+    return [lambda: evaluate_plan(graphs, plan)]
+
+
+def evaluate_wide():
+    # Many short, shallow tasks.
+    graphs, plan = synthetic(100, 10, 3, 5, 50)
+    return [lambda: evaluate_plan(graphs, plan)]
+
+
+def feedback_predictions():
+    predictions = load_predictions()
+    def call():
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return timearena_feedback(None, predictions, None, False)
+    return [call]
+
+
+def feedback_stream_predictions():
+    input_path = os.path.join(tempfile.gettempdir(), "timearena_benchmark_predictions.jsonl")
+    output_path = os.path.join(tempfile.gettempdir(), "timearena_benchmark_scored.jsonl")
+    with open(input_path, "w") as f:
+        for p in load_predictions():
+            f.write(json.dumps(p) + "\n")
+    def call():
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return timearena_feedback_stream(input_path, output_path)
+    return [call]
+
+
+def oracle_val():
+    calls = []
+    for tasks in load_combos():
+        name, task = list(process_data({task: dependencygraph[task] for task in tasks}).items())[0]
+        calls.append(lambda task=task: solve_oracle(task))
+    return calls
+
+
+def oracle_synthetic():
+    graphs, _ = synthetic(10, 10, 4, 4, 10)
+    name, task = list(process_data(graphs).items())[0]
+    return [lambda: solve_oracle(task, "cpsat", 10.0)]
+
+
+def step_rollout():
+    calls = []
+    rng = random.Random(0)
+    for tasks in load_combos():
+        env = TimeArena()
+        env.load(argparse.Namespace(taskName=list(tasks), constraint=False))
+        actions = sorted(set(env.getActionList()))
+        objects = env.getObjectList()
+        for _ in range(100):
+            action = rng.choice(actions).split(" ")
+            if rng.random() < 0.4:
+                command = "wait"
+            elif len(action) == 2:
+                command = f"{action[0]} {rng.choice(objects)} {action[1]} {rng.choice(objects)}"
+            else:
+                command = f"{action[0]} {rng.choice(objects)}"
+            calls.append(lambda env=env, command=command: env.step(command))
+    return calls
+
+
+def replay_predictions():
+    calls = []
+    for p in load_predictions():
+        env = TimeArena()
+        env.load(argparse.Namespace(taskName=list(p['tasks']), constraint=False))
+        calls.append(lambda env=env, plan=p['plan']: env.replay(plan))
+    return calls
+
+
+def metrics_series():
+    from metrics.cal_metric import Completion_Rate, Average_Completion_Time, Average_Progress_Score, Completion_Speed
+    rng = random.Random(0)
+    series = []
+    for _ in range(500):
+        score = 0
+        scores = []
+        for _ in range(120):
+            score = min(100, score + rng.choice([0, 0, 1, 2, 5]))
+            scores.append(score)
+        series.append(scores)
+    return [lambda f=f: f(series) for f in (Completion_Rate, Average_Completion_Time, Average_Progress_Score, Completion_Speed)]
+
+
+WORKLOADS = {
+    "evaluate_plan/example": evaluate_example,
+    "evaluate_plan/predictions": evaluate_predictions,
+    "evaluate_plan/synthetic_long": evaluate_long,
+    "evaluate_plan/synthetic_wide": evaluate_wide,
+    "timearena_feedback/predictions": feedback_predictions,
+    "timearena_feedback_stream/predictions": feedback_stream_predictions,
+    "cal_oracle/val": oracle_val,
+    "cal_oracle/synthetic_cpsat": oracle_synthetic,
+    "TimeArena.step/rollout": step_rollout,
+    "TimeArena.replay/predictions": replay_predictions,
+    "cal_metric/series": metrics_series,
+}
+
+
+def run_workload(workload, repeat=3):
+    """
+    Runs a workload `repeat` times and once more under tracemalloc. Returns the fastest run's wall time, the peak
+    traced memory and the per-call latency percentiles over all timed runs.
+    """
+    walls = []
+    latencies = []
+    for _ in range(repeat):
+        calls = workload()
+        start = time.perf_counter()
+        for call in calls:
+            t = time.perf_counter()
+            call()
+            latencies.append(time.perf_counter() - t)
+        walls.append(time.perf_counter() - start)
+    calls = workload()
+    tracemalloc.start()
+    for call in calls:
+        call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    p50, p90, p99 = np.percentile(np.array(latencies) * 1000, [50, 90, 99])
+    return {
+        "calls": len(calls),
+        "wall_s": round(min(walls), 6),
+        "peak_kb": round(peak / 1024, 1),
+        "p50_ms": round(float(p50), 4),
+        "p90_ms": round(float(p90), 4),
+        "p99_ms": round(float(p99), 4),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Names the measurements that are more than `threshold` (a fraction) above the baseline, per workload.
+    """
+    regressions = {}
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        worse = [k for k in ("wall_s", "peak_kb", "p50_ms") if baseline[name][k] > 0 and result[k] > baseline[name][k] * (1 + threshold)]
+        if worse:
+            regressions[name] = worse
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workloads", type=str, nargs='+', default=list(WORKLOADS), help='workloads to run, all by default')
+    parser.add_argument("--repeat", type=int, default=3, help='timed runs per workload')
+    parser.add_argument("--baseline", type=str, default=os.path.join(HERE, "..", "..", "outputs", "benchmark", "baseline.json"), help='baseline results to compare against')
+    parser.add_argument("--save_baseline", action='store_true', help='store the results as the new baseline')
+    parser.add_argument("--threshold", type=float, default=0.2, help='relative slowdown or memory growth reported as a regression')
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.workloads:
+        results[name] = run_workload(WORKLOADS[name], args.repeat)
+        r = results[name]
+        print(f"{name}: {r['calls']} calls ; wall {r['wall_s']:.4f}s ; peak {r['peak_kb']} KB ; p50 {r['p50_ms']}ms ; p90 {r['p90_ms']}ms ; p99 {r['p99_ms']}ms")
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=4)
+        print(f"Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for name, worse in regressions.items():
+            print(f"REGRESSION {name}: {', '.join(worse)} more than {round(args.threshold * 100)}% above baseline")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline")
@@ -41,6 +41,7 @@ name = "zeroshot_with_reasontrace"
 folder_path = f"Data/TimeArena"
 split = "train"
 out_file_name = f"predictions.json"
+eval_cache_dir = "Outputs/TimeArena/eval_cache"
 #TODO ENDS
 
 output_folder = f"reasoning_traces/{name}/{model}/{split}"
@@ -66,6 +67,11 @@ if os.path.exists(os.path.join(output_folder, out_file_name)):
         data = json.load(file)
         data_contents = data["predictions"]
 
+checkpoint = checkpoint_path(os.path.join(output_folder, out_file_name))
+restored = restore_checkpoint(checkpoint, data_contents)
+if restored:
+    print(f"{restored} samples restored from {checkpoint}")
+
 for idx, content in enumerate(data_contents):
     print(f"Processing {idx}: {content['tasks']} ..")
     if ("plan" not in content) or content["plan"] == None:
@@ -115,29 +121,30 @@ for idx, content in enumerate(data_contents):
         content["reasoning_content"] = reasoning_content
     
         content["cost_summary"] = to_dict(cost_summary)
-        
-
-
-        my_dict = {
-            "task": task,
-            "output_format": output_format,
-            "output_folder_path": output_folder,
-            "predictions": data_contents
-        }
 
-        # Save the output to a json file
-        with open(os.path.join(output_folder, out_file_name), "w") as file:
-            json.dump(my_dict, file, indent=4)
+        append_checkpoint(checkpoint, idx, content)
 
         ("##############################################") 
     else:
         print("Plan already exists for index: ", idx)
 
+my_dict = {
+    "task": task,
+    "output_format": output_format,
+    "output_folder_path": output_folder,
+    "predictions": data_contents
+}
+
+# Save the output to a json file
+with open(os.path.join(output_folder, out_file_name), "w") as file:
+    json.dump(my_dict, file, indent=4)
+clear_checkpoint(checkpoint)
+
 #EVALUATION
 with open(os.path.join(output_folder, out_file_name), "r") as file:
     data = json.load(file)
 
-scores, detailed_scores, detailed_feedback = timearena_feedback(None, data["predictions"], None, False)
+scores, detailed_scores, detailed_feedback = timearena_feedback(None, data["predictions"], None, False, cache_dir=eval_cache_dir)
 
 with open(os.path.join(output_folder, out_file_name), "w") as file:
     data["scores"] = scores
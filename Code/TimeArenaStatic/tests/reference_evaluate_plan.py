@@ -0,0 +1,306 @@
+# evaluate_plan as it was before the event-driven rewrite, kept verbatim as the reference for tests/test_evaluate_plan.py.
+
+def normalize_action(action_name):
+    """
+    Normalize an action name by stripping whitespace and removing a trailing '*' if present.
+    """
+    return action_name.strip().rstrip('*').strip()
+
+def is_idle_action(task_action):
+    """
+    Returns True if the task action is considered idle (its name ends with '*').
+    """
+    return task_action.strip().endswith('*')
+
+def parse_plan(plan):
+    """
+    Parses a plan (list of strings like "0: pick rice") into a dictionary mapping time steps to lists of actions.
+    
+    Enforces:
+      - Every time step from 0 to the maximum time must be explicitly defined.
+      - If a time step contains 'wait', it must be the only entry.
+    """
+    plan_dict = {}
+    for entry in plan:
+        try:
+            time_str, action = entry.split(":", 1)
+        except ValueError:
+            raise ValueError(f"Plan entry '{entry}' is not formatted as 'time: action'.")
+        t = int(time_str.strip())
+        action = action.strip()
+        if t not in plan_dict:
+            plan_dict[t] = []
+        plan_dict[t].append(action)
+    if plan_dict:
+        max_time = max(plan_dict.keys())
+    else:
+        max_time = -1
+    for t in range(max_time + 1):
+        if t not in plan_dict:
+            raise ValueError(f"Missing plan entry for time step {t}. Every time step must be defined (use 'wait' if no action is initiated).")
+        actions = plan_dict[t]
+        if any(normalize_action(a).lower() == "wait" for a in actions) and len(actions) > 1:
+            raise ValueError(f"Time step {t} contains 'wait' along with other actions, which is not allowed.")
+    return plan_dict
+
+def consume_action(available_actions, act):
+    """
+    Consumes one occurrence of an action (by normalized name) from the available_actions list.
+    Returns True if an occurrence was found and removed, else False.
+    """
+    norm_act = normalize_action(act)
+    for i, a in enumerate(available_actions):
+        if normalize_action(a) == norm_act:
+            del available_actions[i]
+            return True
+    return False
+
+def evaluate_plan(tasks, plan):
+    """
+    Evaluate the plan against a set of tasks with the following rules:
+    
+      1. Dependency Order: An action is only counted if all its dependency actions (per the task’s dependency graph)
+         have been completed *before* it is initiated. If not, it is not scheduled and does not contribute progress.
+      
+      2. Wait Enforcement for Non-Idle Actions:
+         - For a non-idle action with duration n, once it is initiated the next n-1 time steps (for that task) must be "wait"
+           (i.e. no new non-idle action may be started).
+         - This is implemented by “locking” the task for non-idle actions until the current one’s finish time.
+         - **New requirement:** While any non-idle action is underway (global lock), no actions (even idle) may be initiated.
+           
+      3. Progress Speed:  
+         At each simulation time step, for each task, the percentage progress is computed as the sum of durations for completed
+         sub‑tasks divided by the total duration.
+         
+      4. Completion Speed:  
+         For each task that is fully completed, the completion time is given as the last subtask's finish time.
+         
+      5. Unique Consumption:  
+         Each plan action occurrence is “consumed” once. That is, if a subtask (e.g. "wash dish") is required by two tasks,
+         it must appear twice in the plan (or in two distinct time steps) to progress both tasks.
+    
+    Parameters:
+      tasks: A dict where each key is a task name and each value is a two-element list:
+             [ durations_dict, dependencies_dict ]
+             - durations_dict maps action names (e.g. "pick rice", "cook rice in pot*") to their duration (in minutes).
+             - dependencies_dict maps an action name to a list of dependency action names.
+      plan: A list of strings representing time-stamped actions (e.g. "0: pick rice", "1: wait", etc.)
+    
+    Returns:
+      A dict with:
+         - For each task: its percentage complete, whether it was fully completed,
+           and a list of errors encountered (dependency violations, wait violations, etc.).
+         - For each task, a "progress_speed" time series showing percentage complete per time step (pruned up to the last action finish time).
+         - For each task, its "completion_speed" (i.e. the time when the task was fully completed, or None).
+         - The overall count of fully completed tasks and the total number of tasks.
+    """
+    # Parse the global plan.
+    plan_dict = parse_plan(plan)
+    
+    # Use a fixed order for tasks.
+    tasks_order = list(tasks.keys())
+    
+    # Initialize a schedule for each task.
+    # For each task, we record scheduled actions as:
+    #    schedule[task][action] = { start_time, finish_time, completed, duration, idle }
+    schedule = { task: {} for task in tasks }
+    
+    # For collecting errors per task.
+    errors = { task: [] for task in tasks }
+    
+    # For non-idle actions, maintain a lock per task (the finish time until which no new non-idle action may start).
+    # (This was previously per-task; now we enforce a global check later.)
+    non_idle_lock = { task: None for task in tasks }
+    
+    # For progress speed: record progress (percentage complete) per time step for each task.
+    progress_speed = { task: {} for task in tasks }
+    
+    # Determine simulation end time.
+    max_plan_time = max(plan_dict.keys()) if plan_dict else 0
+    max_duration = max(max(durations.values()) for durations, _ in tasks.values()) if tasks else 0
+    simulation_end = max_plan_time + max_duration + 1  # +1 to allow completions
+    
+    # Simulation loop: step through each minute.
+    for t in range(simulation_end):
+        # First, mark any actions that finish exactly at this time.
+        for task in tasks_order:
+            for act, record in schedule[task].items():
+                if not record.get("completed", False) and record["finish_time"] == t:
+                    record["completed"] = True
+                    # If this was a non-idle action, release its lock.
+                    if not record["idle"]:
+                        if non_idle_lock[task] == record["finish_time"]:
+                            non_idle_lock[task] = None
+        
+        # At the end of this time step, record progress for each task.
+        for task, (durations, _) in tasks.items():
+            total_duration = sum(durations.values())
+            completed_duration = sum(durations[act] for act in durations 
+                                     if act in schedule[task] and schedule[task][act].get("completed", False))
+            percentage_complete = (completed_duration / total_duration) * 100 if total_duration > 0 else 0
+            progress_speed[task][t] = percentage_complete
+        
+        # Process the plan entry for time t (if any).
+        if t in plan_dict:
+            # Create a copy of the actions available at this time step.
+            available_actions = list(plan_dict[t])
+            # If the only entry is "wait", then skip processing for this time step.
+            if len(available_actions) == 1 and normalize_action(available_actions[0]).lower() == "wait":
+                continue
+            
+            # Global lock check: if any task has a non-idle lock active, no actions may be started.
+            if any(non_idle_lock[task] is not None and t < non_idle_lock[task] for task in tasks_order):
+                for task in tasks_order:
+                    # Build candidate actions for this task.
+                    durations = tasks[task][0]
+                    candidate_actions = []
+                    for act_str in available_actions:
+                        norm_act = normalize_action(act_str)
+                        if norm_act.lower() == "wait":
+                            continue
+                        for task_act in durations:
+                            if normalize_action(task_act) == norm_act:
+                                candidate_actions.append(task_act)
+                    candidate_actions = list(set(candidate_actions))
+                    for act in candidate_actions:
+                        errors[task].append(
+                            f"Action '{act}' initiated at time {t} while a non-idle action is underway (global lock)."
+                        )
+                continue  # Skip processing all tasks at this time step.
+            
+            # If no global lock is active, iterate over tasks in a fixed order.
+            for task in tasks_order:
+                durations, deps = tasks[task]
+                
+                # Build candidate actions for this task from the available actions.
+                candidate_actions = []
+                for act_str in available_actions:
+                    norm_act = normalize_action(act_str)
+                    if norm_act.lower() == "wait":
+                        continue
+                    for task_act in durations:
+                        if normalize_action(task_act) == norm_act:
+                            candidate_actions.append(task_act)
+                candidate_actions = list(set(candidate_actions))
+                
+                # Process non-idle candidates first.
+                non_idle_candidates = [act for act in candidate_actions if not is_idle_action(act)]
+                if len(non_idle_candidates) > 1:
+                    errors[task].append(f"At time {t}, more than one non-idle action initiated: {non_idle_candidates}.")
+                    non_idle_candidates = []
+                if non_idle_candidates:
+                    act = non_idle_candidates[0]
+                    if act in schedule[task]:
+                        errors[task].append(f"Non-idle action '{act}' initiated more than once (at time {t}).")
+                    else:
+                        deps_met = True
+                        if act in deps:
+                            for dep in deps[act]:
+                                dep_candidate = None
+                                for candidate in durations:
+                                    if normalize_action(candidate) == normalize_action(dep):
+                                        dep_candidate = candidate
+                                        break
+                                if dep_candidate is None:
+                                    errors[task].append(f"Dependency '{dep}' for action '{act}' not found in task.")
+                                    deps_met = False
+                                    break
+                                if (dep_candidate not in schedule[task] or 
+                                    not schedule[task][dep_candidate].get("completed", False) or 
+                                    schedule[task][dep_candidate]["finish_time"] > t):
+                                    errors[task].append(
+                                        f"Non-idle action '{act}' started at time {t} before dependency '{dep_candidate}' completed."
+                                    )
+                                    deps_met = False
+                                    break
+                        if deps_met:
+                            duration = durations[act]
+                            schedule[task][act] = {
+                                "start_time": t,
+                                "finish_time": t + duration,
+                                "completed": False,
+                                "duration": duration,
+                                "idle": False
+                            }
+                            # Lock the task until this non-idle action completes.
+                            non_idle_lock[task] = t + duration
+                            consume_action(available_actions, act)
+                
+                # Process idle candidates (multiple idle actions are allowed).
+                idle_candidates = [act for act in candidate_actions if is_idle_action(act)]
+                for act in idle_candidates:
+                    if act in schedule[task]:
+                        errors[task].append(f"Idle action '{act}' initiated more than once (at time {t}).")
+                        continue
+                    deps_met = True
+                    if act in deps:
+                        for dep in deps[act]:
+                            dep_candidate = None
+                            for candidate in durations:
+                                if normalize_action(candidate) == normalize_action(dep):
+                                    dep_candidate = candidate
+                                    break
+                            if dep_candidate is None:
+                                errors[task].append(f"Dependency '{dep}' for idle action '{act}' not found in task.")
+                                deps_met = False
+                                break
+                            if (dep_candidate not in schedule[task] or 
+                                not schedule[task][dep_candidate].get("completed", False) or 
+                                schedule[task][dep_candidate]["finish_time"] > t):
+                                errors[task].append(
+                                    f"Idle action '{act}' initiated at time {t} before dependency '{dep_candidate}' completed."
+                                )
+                                deps_met = False
+                                break
+                    if deps_met:
+                        schedule[task][act] = {
+                            "start_time": t,
+                            "finish_time": t + durations[act],
+                            "completed": False,
+                            "duration": durations[act],
+                            "idle": True
+                        }
+                        consume_action(available_actions, act)
+    
+    # --- Prune progress_speed: for each task, only keep time steps up to the last action finish time.
+    for task in progress_speed:
+        if schedule[task]:
+            max_finish = max(record["finish_time"] for record in schedule[task].values())
+            progress_speed[task] = { t: prog for t, prog in progress_speed[task].items() if t <= max_finish }
+        else:
+            progress_speed[task] = { t: 0 for t in range(simulation_end) }
+    
+    # After simulation, compute results per task.
+    final_results = {}
+    completion_speed = {}  # Completion time per task.
+    for task, (durations, _) in tasks.items():
+        total_duration = sum(durations.values())
+        completed_duration = 0
+        last_finish_time = 0
+        for act in durations:
+            if act in schedule[task] and schedule[task][act].get("completed", False):
+                completed_duration += durations[act]
+                last_finish_time = max(last_finish_time, schedule[task][act]["finish_time"])
+        percentage_complete = (completed_duration / total_duration) * 100 if total_duration > 0 else 0
+        fully_completed = all(
+            act in schedule[task] and schedule[task][act].get("completed", False)
+            for act in durations
+        )
+        final_results[task] = {
+            "percentage_complete": percentage_complete,
+            "fully_completed": fully_completed,
+            "errors": errors[task]
+        }
+        completion_speed[task] = last_finish_time if fully_completed else None
+    
+    num_fully_completed = sum(1 for task in final_results if final_results[task]["fully_completed"])
+    total_tasks = len(tasks)
+    
+    overall_result = {
+        "final_results": final_results,
+        "progress_speed": progress_speed,         # Pruned progress time series for each task.
+        "completion_time": completion_speed,       # Completion time per task.
+        "num_fully_completed": num_fully_completed,
+        "total_tasks": total_tasks
+    }
+    return overall_result
@@ -0,0 +1,64 @@
+import argparse
+import json
+import os
+import random
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from TimeArena import TimeArena
+
+VAL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "Data", "TimeArena", "val.json")
+
+
+def combos():
+    with open(VAL_FILE) as f:
+        return sorted({tuple(sample["tasks"]) for sample in json.load(f)})
+
+
+def random_command(rng, env):
+    action = rng.choice(sorted(set(env.getActionList()))).split(" ")
+    objects = env.getObjectList()
+    if len(action) == 2:
+        return f"{action[0]} {rng.choice(objects)} {action[1]} {rng.choice(objects)}"
+    return f"{action[0]} {rng.choice(objects)}"
+
+
+def test_advance_matches_stepping_minute_by_minute():
+    # advance(n) must leave the simulator exactly where stepping the same minutes one by one does: 'wait', or the
+    # running occupying action, which a 'wait' continues.
+    checks = 0
+    for n, combo in enumerate(combos()[:12]):
+        rng = random.Random(n)
+        env = TimeArena()
+        env.load(argparse.Namespace(taskName=list(combo), constraint=False))
+        for step in range(120):
+            env.step("wait" if rng.random() < 0.4 else random_command(rng, env))
+            if step % 8 != 7:
+                continue
+            until = rng.choice([None, 1, 3, 7])
+            advanced = env.fork()
+            stepped = env.fork()
+            action = stepped.running_action() or "wait"
+            _, increment, done, _, minutes = advanced.advance(until)
+            if until is not None:
+                assert minutes <= until
+            total = 0
+            for _ in range(minutes):
+                _, step_increment, step_done, _, _ = stepped.step(action, structured=True)
+                total += step_increment
+            assert advanced.snapshot() == stepped.snapshot()
+            assert (increment, done) == (total, stepped.isCompleted)
+            checks += 1
+    assert checks > 100
+
+
+def test_advance_with_nothing_running_equals_waits():
+    env = TimeArena()
+    env.load(argparse.Namespace(taskName=["household1"], constraint=False))
+    env.step("activate kettle")
+    advanced = env.fork()
+    stepped = env.fork()
+    _, _, _, _, minutes = advanced.advance(10)
+    for _ in range(minutes):
+        stepped.step("wait")
+    assert minutes > 1
+    assert advanced.snapshot() == stepped.snapshot()
@@ -0,0 +1,79 @@
+import ast
+import copy
+import json
+import os
+import random
+import re
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import EvalArena
+import reference_evaluate_plan as reference
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PREDICTIONS_FILE = os.path.join(HERE, "reasoning_traces", "zeroshot_with_reasontrace", "deepseek-reasoner", "train", "predictions.json")
+
+
+def load_predictions():
+    with open(PREDICTIONS_FILE) as f:
+        return [p for p in json.load(f)["predictions"] if isinstance(p.get("plan"), list)]
+
+
+def greedy_plan(rng, graphs):
+    # A mostly valid plan: actions in a random order that respects the dependencies, with some idle minutes.
+    plan = []
+    finish = {}
+    remaining = [(a, d, dependencies.get(a, [])) for durations, dependencies in graphs.values() for a, d in durations.items()]
+    t = 0
+    while remaining and t < 400:
+        ready = [x for x in remaining if all(finish.get(p, 10**9) <= t for p in x[2])]
+        if ready and rng.random() < 0.8:
+            action, duration, _ = rng.choice(ready)
+            remaining = [x for x in remaining if x[0] != action]
+            plan.append(f"{t}: {action.rstrip('*')}")
+            finish[action] = t + duration
+            if action.endswith("*"):
+                t += 1
+            else:
+                plan += [f"{t + k}: wait" for k in range(1, duration)]
+                t += duration
+        else:
+            plan.append(f"{t}: wait")
+            t += 1
+    return plan
+
+
+def evaluate(module, graphs, plan):
+    try:
+        return module.evaluate_plan(graphs, plan)
+    except Exception as e:
+        return (type(e).__name__, str(e))
+
+
+def canonical(result):
+    # The rewrite reports the errors of a task in another order, and lists initiated actions as a set.
+    if not isinstance(result, dict):
+        return result
+    result = copy.deepcopy(result)
+    for task in result["final_results"].values():
+        errors = []
+        for error in task["errors"]:
+            initiated = re.search(r"initiated: (\[.*\])\.$", error)
+            if initiated:
+                error = error[:initiated.start(1)] + repr(sorted(ast.literal_eval(initiated.group(1)))) + "."
+            errors.append(error)
+        task["errors"] = sorted(errors)
+    return result
+
+
+def test_evaluate_plan_matches_reference_on_stored_predictions():
+    for p in load_predictions():
+        assert canonical(evaluate(EvalArena, p["dependency_graph"], p["plan"])) == canonical(evaluate(reference, p["dependency_graph"], p["plan"]))
+
+
+def test_evaluate_plan_matches_reference_on_generated_plans():
+    rng = random.Random(0)
+    graphs = [p["dependency_graph"] for p in load_predictions()]
+    for _ in range(50):
+        g = rng.choice(graphs)
+        plan = greedy_plan(rng, g)
+        assert canonical(evaluate(EvalArena, g, plan)) == canonical(evaluate(reference, g, plan))
@@ -0,0 +1,31 @@
+import json
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from EvalArena import timearena_feedback, timearena_feedback_stream
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PREDICTIONS_FILE = os.path.join(HERE, "reasoning_traces", "zeroshot_with_reasontrace", "deepseek-reasoner", "train", "predictions.json")
+
+
+def load_predictions():
+    with open(PREDICTIONS_FILE) as f:
+        return json.load(f)["predictions"]
+
+
+def test_feedback_paths_agree(tmp_path):
+    predictions = load_predictions()
+    serial = timearena_feedback(None, predictions, None)
+    assert timearena_feedback(None, predictions, None, workers=2) == serial
+    cache_dir = str(tmp_path / "cache")
+    assert timearena_feedback(None, predictions, None, cache_dir=cache_dir) == serial
+    # The second run is answered from the cache.
+    assert timearena_feedback(None, predictions, None, cache_dir=cache_dir) == serial
+
+    input_path = tmp_path / "predictions.jsonl"
+    output_path = tmp_path / "predictions_scored.jsonl"
+    input_path.write_text("".join(json.dumps(p) + "\n" for p in predictions))
+    scores, detailed_scores = timearena_feedback_stream(str(input_path), str(output_path), workers=2, batch_size=7)
+    with open(output_path) as f:
+        detailed_feedback = [json.loads(line) for line in f]
+    assert [scores, detailed_scores, detailed_feedback] == json.loads(json.dumps(list(serial)))
@@ -0,0 +1,25 @@
+import json
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from TimeArena import TimeAnera, load_registry, get_task
+
+VAL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "Data", "TimeArena", "val.json")
+
+
+def test_registry_reproduces_the_stored_queries():
+    # val.json was generated with the per-task classes the registry replaced.
+    with open(VAL_FILE) as f:
+        data = json.load(f)
+    for sample in data:
+        env = TimeAnera()
+        env.load(sample["tasks"])
+        assert env.getDatapoint() == (sample["query"], sample["dependency_graph"])
+
+
+def test_registry_tasks_are_fresh_per_load():
+    task = get_task("household1")
+    objects = task.add_objects()
+    objects[0].properties["todo"]["brew_with_1"] = 0
+    assert task.add_objects()[0].properties["todo"]["brew_with_1"] == 3
+    assert set(load_registry()) >= {"cooking1", "household1", "lab1"}
@@ -0,0 +1,64 @@
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from EvalArena import evaluate_plan
+from algorithm.dependency_registry import get_graphs
+from TimeArena import TimeArena
+
+# household1 (make a cup of tea) ends on 'pour teapot into cup', an occupying action of 3 minutes.
+PLAN = [
+    "0: activate kettle",
+    "1: wash teapot",
+    "2: wash cup",
+    "3: wait",
+    "4: wait",
+    "5: pour kettle into teapot",
+    "6: wait",
+    "7: brew tea with teapot",
+    "8: wait",
+    "9: wait",
+    "10: pour teapot into cup",
+]
+
+# lab1+lab2 prediction from the deepseek-reasoner traces: 'cut sodium_flakes' at 18 cuts off the 2-minute
+# 'add sulfuric_acid to beaker' started at 17.
+LAB_PLAN = [
+    "0: wash test_tube", "1: wait", "2: wait", "3: wait", "4: add solution to test_tube", "5: wait", "6: wait",
+    "7: wait", "8: heat test_tube", "9: wash beaker", "10: wait", "11: wait", "12: find sulfuric_acid",
+    "13: find sodium_flakes", "14: dilute sulfuric_acid", "15: wait", "16: wait", "17: add sulfuric_acid to beaker",
+    "18: cut sodium_flakes", "19: wait", "20: heat sodium_flakes", "21: wait", "22: wait", "23: wait", "24: wait",
+    "25: add sodium_flakes to beaker", "26: wait",
+]
+
+
+def replay(plan, tasks=("household1",)):
+    env = TimeArena()
+    env.load(argparse.Namespace(taskName=list(tasks), constraint=False))
+    return env.replay(plan)
+
+
+def test_replay_finishes_actions_running_after_the_last_line():
+    result = replay(PLAN)
+    assert result["completion_time"] == 13
+    assert result["score"] == 100
+    assert result["completion_time"] == evaluate_plan(get_graphs(["household1"]), PLAN)["completion_time"]["household1"]
+
+
+def test_replay_trailing_waits_do_not_change_completion():
+    assert replay(PLAN + ["11: wait", "12: wait", "13: wait", "14: wait"])["completion_time"] == 13
+
+
+def test_replay_stops_when_nothing_is_in_flight():
+    result = replay(PLAN[:3])
+    assert result["completion_time"] is None
+    assert len(result["progress"]) == 5
+
+
+def test_replay_reports_interrupted_actions():
+    result = replay(LAB_PLAN, ("lab1", "lab2"))
+    assert result["rejected"] == []
+    assert result["interrupted"] == [(18, "add sulfuric_acid to beaker", 1)]
+    errors = evaluate_plan(get_graphs(["lab1", "lab2"]), LAB_PLAN)["final_results"]["lab2"]["errors"]
+    assert any("'cut sodium_flakes' initiated at time 18" in error for error in errors)
+    assert replay(PLAN)["interrupted"] == []
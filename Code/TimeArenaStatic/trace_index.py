@@ -0,0 +1,50 @@
+import hashlib
+import json
+import os
+import numpy as np
+
+
+class TraceIndex:
+    """
+    Nearest-neighbour index over training reasoning traces, by sentence-transformers embedding of their queries.
+    The normalized embeddings are kept as <path>.npy, next to <path>.json with the model and a fingerprint of the
+    queries, and are only recomputed when either changes.
+    """
+    DEFAULT_MODEL = "all-MiniLM-L6-v2"
+
+    def __init__(self, traces, path, model_name=DEFAULT_MODEL):
+        from sentence_transformers import SentenceTransformer
+        self.traces = traces
+        self.encoder = SentenceTransformer(model_name)
+        queries = [trace["query"] for trace in traces]
+        fingerprint = hashlib.sha256(json.dumps([model_name, queries], ensure_ascii=False).encode("utf-8")).hexdigest()
+        if os.path.exists(path + ".npy") and os.path.exists(path + ".json"):
+            with open(path + ".json", "r") as file:
+                stored = json.load(file)
+            if stored["fingerprint"] == fingerprint:
+                self.matrix = np.load(path + ".npy")
+                return
+        self.matrix = self.encode(queries)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.save(path + ".npy", self.matrix)
+        with open(path + ".json", "w") as file:
+            json.dump({"model": model_name, "fingerprint": fingerprint, "ids": [trace.get("id") for trace in traces]}, file, indent=4)
+
+    def encode(self, texts):
+        return self.encoder.encode(texts, normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+    def search(self, query, k, candidates=None):
+        """
+        The k traces whose queries are most similar to query, most similar first. candidates restricts the search
+        to the traces at those positions.
+        """
+        candidates = np.arange(len(self.traces)) if candidates is None else np.asarray(list(candidates), dtype=int)
+        if k <= 0 or len(candidates) == 0:
+            return []
+        scores = self.matrix[candidates] @ self.encode([query])[0]
+        if k < len(candidates):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [self.traces[i] for i in candidates[top]]
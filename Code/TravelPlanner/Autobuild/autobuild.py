@@ -111,6 +111,11 @@ agent_list, agent_configs = builder.build(building_task, default_llm_config, cod
 saved_path = builder.save(os.path.join(output_folder, "travel_agents.json"))
 
 
+checkpoint = checkpoint_path(os.path.join(output_folder, f"agents_{split}_predictions" + ".json"))
+restored = restore_checkpoint(checkpoint, data_contents)
+if restored:
+    print(f"{restored} queries restored from {checkpoint}")
+
 for idx, content in zip(data_indices, data_contents):
     if "plan" not in content:
         intermediate_outputs = dict()
@@ -165,22 +170,25 @@ for idx, content in zip(data_indices, data_contents):
     
         content["cost_summary"] = cost_summary
 
-        my_dict = {
-            "task": task,
-            "output_format": output_format,
-            "output_folder_path": output_folder,
-            "predictions": data_contents
-        }
-
-        # Save the output to a json file
-        with open(os.path.join(output_folder, f"agents_{split}_predictions" + ".json"), "w") as file:
-            json.dump(my_dict, file, indent=4)
+        append_checkpoint(checkpoint, idx, content)
 
         ("##############################################")
     
     else:
         print("Plan already exists for index: ", idx)
 
+my_dict = {
+    "task": task,
+    "output_format": output_format,
+    "output_folder_path": output_folder,
+    "predictions": data_contents
+}
+
+# Save the output to a json file
+with open(os.path.join(output_folder, f"agents_{split}_predictions" + ".json"), "w") as file:
+    json.dump(my_dict, file, indent=4)
+clear_checkpoint(checkpoint)
+
 #EVALUATION
 with open(os.path.join(output_folder, f"agents_{split}_predictions" + ".json"), "r") as file:
     data = json.load(file)
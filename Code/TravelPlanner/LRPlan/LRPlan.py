@@ -7,10 +7,12 @@ import ast
 import autogen
 
 import copy
+from concurrent.futures import ThreadPoolExecutor
 
 from autogen import ConversableAgent
 
 from agent_utils import *
+from trace_index import TraceIndex
 
 from Prompts.travelplanner import task, input_variables_descriptions, output_format, input_output_pairs
 domain = "travelplanner"
@@ -36,6 +38,10 @@ reasoning_file = "Code/TravelPlanner/reasoning_traces/zeroshot_with_reasontrace/
 output_folder = f"outputs/{name}/{model}/" 
 config_list = autogen.config_list_from_json("OAI_CONFIG_LIST")
 NUM_SAMPLES = 5 # Number of positive or negative samples to use for training
+meta_cache_dir = "outputs/meta_agent_cache" # Meta-agent replies by content hash, reused while the prompts, traces and model match
+# Traces of each verdict retrieved per query by embedding similarity; None uses the first NUM_SAMPLES for all
+RETRIEVAL_K = None
+trace_index_path = "outputs/trace_index/deepseek-reasoner_train" # Embeddings of the reasoning file's queries, used with RETRIEVAL_K
 #TODO ENDS
 
 filter_dict = {"model": [model]}
@@ -92,41 +98,70 @@ for r_pred, r_dfeed in zip(r_predictions, r_detailed_feedback):
             "reasoning_content": reasoning_content
         })
 
-training_inputs_outputs = ""
-zidx = 1
-for t_dict in correct_predictions[:NUM_SAMPLES]:
-    training_inputs_outputs += f"SAMPLE INPUT #{zidx}:\n{t_dict['query']}\nSAMPLE REASONING TRACE #{zidx}:\n{t_dict['reasoning_content']}\nVERDICT: Correct\n\n"
-    zidx += 1
+def get_building_task(correct, wrong):
+    training_inputs_outputs = ""
+    zidx = 1
+    for t_dict in correct:
+        training_inputs_outputs += f"SAMPLE INPUT #{zidx}:\n{t_dict['query']}\nSAMPLE REASONING TRACE #{zidx}:\n{t_dict['reasoning_content']}\nVERDICT: Correct\n\n"
+        zidx += 1
 
-for t_dict in wrong_predictions[:NUM_SAMPLES]:
-    training_inputs_outputs += f"SAMPLE INPUT #{zidx}:\n{t_dict['query']}\nSAMPLE REASONING TRACE #{zidx}:\n{t_dict['reasoning_content']}\nVERDICT: Incorrect\n\n"
-    zidx += 1
+    for t_dict in wrong:
+        training_inputs_outputs += f"SAMPLE INPUT #{zidx}:\n{t_dict['query']}\nSAMPLE REASONING TRACE #{zidx}:\n{t_dict['reasoning_content']}\nVERDICT: Incorrect\n\n"
+        zidx += 1
 
 
-building_task = f"""
+    building_task = f"""
 TASK DESCRIPTION: {task}\n
 OUTPUT FORMAT: {output_format}\n
 {training_inputs_outputs}
 """
-
-print("Building Task: ", building_task)
-# print("Total Correct Predictions: ", len(correct_predictions))
-
-pattern_recognizer = get_agent(llm_config_list, PATTERN_RECOGNIZER_SYSTEM_PROMPT, "pattern-recognizer")
-rule_extractor = get_agent(llm_config_list, RULE_EXTRACTOR_SYSTEM_PROMPT, "rule-extractor")
-self_corrector = get_agent(llm_config_list, SELF_CORRECTOR_SYSTEM_PROMPT, "self-corrector")
-
-pattern_recognizer_prompt = PATTERN_RECOGNIZER_PROMPT.replace("<<<sample_input_reasoning_trace>>>", building_task)
-pattern_recognizer_reply = pattern_recognizer.generate_reply(messages=[{"content": pattern_recognizer_prompt, "role": "user"}])
-print("[PATTERN RECOGNIZER REPLY]:", pattern_recognizer_reply)
-
-self_corrector_prompt = SELF_CORRECTOR_PROMPT.replace("<<<sample_input_reasoning_trace>>>", building_task)
-self_corrector_reply = self_corrector.generate_reply(messages=[{"content": self_corrector_prompt, "role": "user"}])
-print("[SELF CORRECTOR REPLY]:", self_corrector_reply)
-
-rule_extractor_prompt = RULE_EXTRACTOR_PROMPT.replace("<<<identified_research_patterns>>>", pattern_recognizer_reply)
-rule_extractor_reply = rule_extractor.generate_reply(messages=[{"content": rule_extractor_prompt, "role": "user"}])
-print("[RULE EXTRACTOR REPLY]:", rule_extractor_reply)
+    return building_task
+
+
+def meta_analysis(building_task):
+    """
+    Runs the meta agents over building_task. Returns their replies and the agents, for the cost summary.
+    """
+    print("Building Task: ", building_task)
+
+    pattern_recognizer = get_agent(llm_config_list, PATTERN_RECOGNIZER_SYSTEM_PROMPT, "pattern-recognizer")
+    rule_extractor = get_agent(llm_config_list, RULE_EXTRACTOR_SYSTEM_PROMPT, "rule-extractor")
+    self_corrector = get_agent(llm_config_list, SELF_CORRECTOR_SYSTEM_PROMPT, "self-corrector")
+
+    # The self corrector only reads building_task, so it runs in the background while the rule extractor waits on the
+    # pattern recognizer.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        self_corrector_prompt = SELF_CORRECTOR_PROMPT.replace("<<<sample_input_reasoning_trace>>>", building_task)
+        self_corrector_future = pool.submit(cached_reply, self_corrector, self_corrector_prompt, meta_cache_dir)
+
+        pattern_recognizer_prompt = PATTERN_RECOGNIZER_PROMPT.replace("<<<sample_input_reasoning_trace>>>", building_task)
+        pattern_recognizer_reply = cached_reply(pattern_recognizer, pattern_recognizer_prompt, meta_cache_dir)
+        print("[PATTERN RECOGNIZER REPLY]:", pattern_recognizer_reply)
+
+        rule_extractor_prompt = RULE_EXTRACTOR_PROMPT.replace("<<<identified_research_patterns>>>", pattern_recognizer_reply)
+        rule_extractor_reply = cached_reply(rule_extractor, rule_extractor_prompt, meta_cache_dir)
+
+        self_corrector_reply = self_corrector_future.result()
+    print("[SELF CORRECTOR REPLY]:", self_corrector_reply)
+    print("[RULE EXTRACTOR REPLY]:", rule_extractor_reply)
+
+    replies = {
+        "pattern_recognizer": pattern_recognizer_reply,
+        "rule_extractor": rule_extractor_reply,
+        "self_corrector": self_corrector_reply,
+    }
+    return replies, [pattern_recognizer, rule_extractor, self_corrector]
+
+
+if RETRIEVAL_K is None:
+    agent_replies, meta_agents = meta_analysis(get_building_task(correct_predictions[:NUM_SAMPLES], wrong_predictions[:NUM_SAMPLES]))
+else:
+    # Queries with the same neighbours, in any order, share one meta analysis.
+    agent_replies = None
+    trace_index = TraceIndex(correct_predictions + wrong_predictions, trace_index_path)
+    correct_positions = range(len(correct_predictions))
+    wrong_positions = range(len(correct_predictions), len(correct_predictions) + len(wrong_predictions))
+    analyses = {}
 
 planner = get_agent(llm_config_list, "You are a Planner Expert.", "planner")
 refiner = get_agent(llm_config_list2, "You are a Refiner Expert.", "refiner")
@@ -141,103 +176,131 @@ You are a Refiner Expert. Make use of the self correction insights and the plan
 """
 
 
+checkpoint = checkpoint_path(os.path.join(output_folder, f"agents_predictions_{split}" + ".json"))
+restored = restore_checkpoint(checkpoint, data_contents)
+if restored:
+    print(f"{restored} queries restored from {checkpoint}")
+
+# A failed query is logged and left without a plan; the others are still planned and saved, and a rerun retries it.
+failures = []
 for idx, content in zip(data_indices, data_contents):
     if "plan" not in content:
-        intermediate_outputs = dict()
-        content["idx"] = idx
-        query = content['query']
-        print("Query: ", query)
-
-        reference_information = eval(content['reference_information'])
-
-        #[Additional information and preprocessing]
-        attractions, accommodations, restaurants, transportation, metadata = get_reference_information_in_chunks_jsonified(reference_information)
-
-
-        input_variables = {
-            "query": query + "\n" + metadata,
-            "list_of_attractions": attractions,
-            "list_of_accommodations": accommodations,
-            "list_of_restaurants": restaurants,
-            "list_of_transportations": transportation
-        }
-
-        sample_outputs = ""
-        if len(input_output_pairs) > 0:
-            for index, ipop in enumerate(input_output_pairs):
-                sample_outputs += f"SAMPLE OUTPUT {str(index)}: {ipop['sample_output']}\n"
-        else:
+        try:
+            intermediate_outputs = dict()
+            content["idx"] = idx
+            query = content['query']
+            print("Query: ", query)
+
+            reference_information = eval(content['reference_information'])
+
+            #[Additional information and preprocessing]
+            attractions, accommodations, restaurants, transportation, metadata = get_reference_information_in_chunks_jsonified(reference_information)
+
+
+            if RETRIEVAL_K is None:
+                replies, agents = agent_replies, meta_agents
+            else:
+                correct = trace_index.search(query, RETRIEVAL_K, correct_positions)
+                wrong = trace_index.search(query, RETRIEVAL_K, wrong_positions)
+                ids = [t_dict["idx"] for t_dict in correct + wrong]
+                key = tuple(sorted(ids))
+                if key not in analyses:
+                    analyses[key] = meta_analysis(get_building_task(correct, wrong))
+                replies, agents = analyses[key]
+                content["retrieved_traces"] = ids
+                content["agent_replies"] = replies
+
+            input_variables = {
+                "query": query + "\n" + metadata,
+                "list_of_attractions": attractions,
+                "list_of_accommodations": accommodations,
+                "list_of_restaurants": restaurants,
+                "list_of_transportations": transportation
+            }
+
             sample_outputs = ""
+            if len(input_output_pairs) > 0:
+                for index, ipop in enumerate(input_output_pairs):
+                    sample_outputs += f"SAMPLE OUTPUT {str(index)}: {ipop['sample_output']}\n"
+            else:
+                sample_outputs = ""
 
 
-        planner_prefix_variables = f"""
-        ###TASK DESCRIPTION: {task}\n
-        ###OUTPUT FORMAT: {output_format}\n
-        ###IDENTIFIED REASONING PATTERNS: {pattern_recognizer_reply}\n
-        ###HEURISTICS: {rule_extractor_reply}\n"""
+            planner_prefix_variables = f"""
+            ###TASK DESCRIPTION: {task}\n
+            ###OUTPUT FORMAT: {output_format}\n
+            ###IDENTIFIED REASONING PATTERNS: {replies["pattern_recognizer"]}\n
+            ###HEURISTICS: {replies["rule_extractor"]}\n"""
 
-        planner_output = planner.generate_reply(messages=[{"content": planner_prefix_prompt + planner_prefix_variables + formatter_prompt + sample_outputs + convert_to_text(input_variables) + "\n OUTPUT:", "role": "user"}])
+            planner_output = planner.generate_reply(messages=[{"content": planner_prefix_prompt + planner_prefix_variables + formatter_prompt + sample_outputs + convert_to_text(input_variables) + "\n OUTPUT:", "role": "user"}])
 
-        refiner_prefix_variables = f"""
-        ###PLANNER EXPERT REPLY: {planner_output}\n
-        ###SELF-CORRECTION INSIGHTS: {self_corrector_reply}\n
-        """
+            refiner_prefix_variables = f"""
+            ###PLANNER EXPERT REPLY: {planner_output}\n
+            ###SELF-CORRECTION INSIGHTS: {replies["self_corrector"]}\n
+            """
 
-        refiner_output = refiner.generate_reply(messages=[{"content": refiner_prefix_prompt + refiner_prefix_variables +formatter_prompt + sample_outputs + convert_to_text(input_variables) + "\n OUTPUT:", "role": "user"}])
+            refiner_output = refiner.generate_reply(messages=[{"content": refiner_prefix_prompt + refiner_prefix_variables +formatter_prompt + sample_outputs + convert_to_text(input_variables) + "\n OUTPUT:", "role": "user"}])
 
-        content["prompts"] = {
-            "planner_prompt": planner_prefix_prompt + planner_prefix_variables + "formatter_prompt + sample_outputs + <<<convert_to_text(input_variables)>>>" + "\n OUTPUT:",
-            "refiner_prompt": refiner_prefix_prompt + refiner_prefix_variables + "formatter_prompt + sample_outputs + <<<convert_to_text(input_variables)>>>" + "\n OUTPUT:"
-        }
-        
-        content["intermediate_outputs"] = {
-            "planner": planner_output,
-            "refiner": refiner_output
-        }
+            content["prompts"] = {
+                "planner_prompt": planner_prefix_prompt + planner_prefix_variables + "formatter_prompt + sample_outputs + <<<convert_to_text(input_variables)>>>" + "\n OUTPUT:",
+                "refiner_prompt": refiner_prefix_prompt + refiner_prefix_variables + "formatter_prompt + sample_outputs + <<<convert_to_text(input_variables)>>>" + "\n OUTPUT:"
+            }
 
-        final_output = refiner_output
-        
-        cost_summary = autogen.gather_usage_summary([planner, refiner, pattern_recognizer, rule_extractor, self_corrector])
-        print("USAGE COST: ", cost_summary)
+            content["intermediate_outputs"] = {
+                "planner": planner_output,
+                "refiner": refiner_output
+            }
 
-        try:
-            # final_output = final_output.replace("```python", "").replace("```json", "").replace("```", "").strip()
-            final_output = extract_list_with_brackets(final_output)
-            final_plan = ast.literal_eval(final_output)
-            print("SUCCESS!")
-        except Exception as e:
-            final_plan = final_output
+            final_output = refiner_output
 
-        content["plan"] = final_plan
+            cost_summary = autogen.gather_usage_summary([planner, refiner] + agents)
+            print("USAGE COST: ", cost_summary)
 
-        print("Final Plan: ", final_plan)
-        print("$"*50)
-        
-    
-        content["cost_summary"] = cost_summary
-        
-
-        my_dict = {
-            "task": task,
-            "output_format": output_format,
-            "output_folder_path": output_folder,
-            "predictions": data_contents,
-            "agent_replies": {
-                "pattern_recognizer": pattern_recognizer_reply,
-                "rule_extractor": rule_extractor_reply,
-                "self_corrector": self_corrector_reply,
-            }
-        }
+            try:
+                # final_output = final_output.replace("```python", "").replace("```json", "").replace("```", "").strip()
+                final_output = extract_list_with_brackets(final_output)
+                final_plan = ast.literal_eval(final_output)
+                print("SUCCESS!")
+            except Exception as e:
+                final_plan = final_output
 
-        # Save the output to a json file
-        with open(os.path.join(output_folder, f"agents_predictions_{split}" + ".json"), "w") as file:
-            json.dump(my_dict, file, indent=4)
+            content["plan"] = final_plan
+
+            print("Final Plan: ", final_plan)
+            print("$"*50)
+
+
+            content["cost_summary"] = cost_summary
+        except Exception as e:
+            print(f"Query {idx} failed: {e!r}")
+            failures.append(idx)
+            continue
+
+        append_checkpoint(checkpoint, idx, content)
 
         ("##############################################")
     
     else:
         print("Plan already exists for index: ", idx)
 
+my_dict = {
+    "task": task,
+    "output_format": output_format,
+    "output_folder_path": output_folder,
+    "predictions": data_contents,
+}
+# With RETRIEVAL_K, the replies are kept per prediction instead.
+if agent_replies is not None:
+    my_dict["agent_replies"] = agent_replies
+
+# Save the output to a json file
+with open(os.path.join(output_folder, f"agents_predictions_{split}" + ".json"), "w") as file:
+    json.dump(my_dict, file, indent=4)
+
+if failures:
+    raise RuntimeError(f"{len(failures)} queries failed, rerun to retry them: {failures}")
+clear_checkpoint(checkpoint)
+
 #EVALUATION
 with open(os.path.join(output_folder, f"agents_predictions_{split}" + ".json"), "r") as file:
     data = json.load(file)
@@ -103,6 +103,11 @@ if __name__ == "__main__":
 
     data_indices = [i for i in range(len(data_contents))]
 
+    checkpoint = checkpoint_path(save_path)
+    restored = restore_checkpoint(checkpoint, data_contents)
+    if restored:
+        print(f"{restored} queries restored from {checkpoint}")
+
     for idx, content in enumerate(data_contents):
         if "plan" in content:
             print(f"Plan already exists for {idx}")
@@ -177,17 +182,19 @@ if __name__ == "__main__":
         content["plan_selector_reply"] = plan_selector_reply
 
 
-        my_dict = {
-            "task": task,
-            "output_format": output_format,
-            "output_folder_path": output_folder,
-            "predictions": data_contents,
-        }
+        append_checkpoint(checkpoint, idx, content)
 
-        # Save the output to a json file
-        with open(save_path, "w") as file:
-            json.dump(my_dict, file, indent=4)
-        
+    my_dict = {
+        "task": task,
+        "output_format": output_format,
+        "output_folder_path": output_folder,
+        "predictions": data_contents,
+    }
+
+    # Save the output to a json file
+    with open(save_path, "w") as file:
+        json.dump(my_dict, file, indent=4)
+    clear_checkpoint(checkpoint)
 
     #EVALUATION
     with open(save_path, "r") as file:
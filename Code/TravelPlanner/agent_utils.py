@@ -4,6 +4,7 @@ import pandas as pd
 import numpy as np
 import sys
 import os
+import hashlib
 from autogen import ConversableAgent
 
 ## To add the path to the folder outside the current directory
@@ -361,4 +362,84 @@ def is_travelplanner_correct(detailed_evaluation):
             for k, v in value.items():
                 if v[0] == False:
                     return False
-    return True
\ No newline at end of file
+    return True
+
+def checkpoint_path(path):
+    """
+    Path of the append-only JSONL log kept next to a predictions file.
+    """
+    return os.path.splitext(path)[0] + ".checkpoint.jsonl"
+
+
+def append_checkpoint(path, index, sample):
+    """
+    Appends one finished sample to the checkpoint log as a single compact JSON line, flushed and fsynced, so a crash
+    loses at most the sample in progress.
+    """
+    with open(path, "a") as file:
+        file.write(json.dumps({"index": index, "sample": sample}, ensure_ascii=False) + "\n")
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def restore_checkpoint(path, samples):
+    """
+    Puts the samples logged at path back at their index in samples and returns how many were restored. A last line
+    cut off by a crash is dropped from the log, so appending can continue after it.
+    """
+    if not os.path.exists(path):
+        return 0
+    with open(path, "rb") as file:
+        content = file.read()
+    complete = content[:content.rfind(b"\n") + 1]
+    if len(complete) < len(content):
+        with open(path, "r+b") as file:
+            file.truncate(len(complete))
+    restored = 0
+    for line in complete.decode("utf-8").splitlines():
+        record = json.loads(line)
+        samples[record["index"]] = record["sample"]
+        restored += 1
+    return restored
+
+
+def clear_checkpoint(path):
+    """
+    Removes the checkpoint log once the predictions it backs are saved, so a later run does not restore stale samples.
+    """
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def reply_cache_key(agent, prompt):
+    """
+    Content address of an agent's reply to a prompt: a hash of the agent's models, system message and prompt. The
+    prompt already holds the filled-in template, so changing the template or the selected traces changes the key.
+    """
+    models = [config.get("model") for config in agent.llm_config["config_list"]]
+    payload = json.dumps([models, agent.system_message, prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cached_reply(agent, prompt, cache_dir=None, generate=None):
+    """
+    agent.generate_reply for a single user prompt, stored as <key>.json in cache_dir and reused while the key
+    matches. Without cache_dir, the reply is always generated. generate(agent, prompt), if given, produces the reply
+    on a cache miss instead (e.g. to apply a per-model request limit).
+    """
+    if generate is None:
+        generate = lambda agent, prompt: agent.generate_reply(messages=[{"content": prompt, "role": "user"}])
+    if cache_dir is None:
+        return generate(agent, prompt)
+    path = os.path.join(cache_dir, reply_cache_key(agent, prompt) + ".json")
+    if os.path.exists(path):
+        with open(path, "r") as file:
+            print(f"[{agent.name}] reply loaded from {path}")
+            return json.load(file)["reply"]
+    reply = generate(agent, prompt)
+    if reply is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(path + ".tmp", "w") as file:
+            json.dump({"agent": agent.name, "prompt": prompt, "reply": reply}, file, ensure_ascii=False, indent=4)
+        os.replace(path + ".tmp", path)
+    return reply
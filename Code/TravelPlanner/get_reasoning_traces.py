@@ -61,6 +61,11 @@ if os.path.exists(os.path.join(output_folder, out_file_name)):
         data = json.load(file)
         data_contents = data["predictions"]
 
+checkpoint = checkpoint_path(os.path.join(output_folder, out_file_name))
+restored = restore_checkpoint(checkpoint, data_contents)
+if restored:
+    print(f"{restored} queries restored from {checkpoint}")
+
 for idx, content in zip(data_indices, data_contents):
     print(f"Processing {idx} ..")
     if ("plan" not in content) or content["plan"] == None:
@@ -123,21 +128,24 @@ for idx, content in zip(data_indices, data_contents):
         
         
 
-        my_dict = {
-            "task": task,
-            "output_format": output_format,
-            "output_folder_path": output_folder,
-            "predictions": data_contents
-        }
-
-        # Save the output to a json file
-        with open(os.path.join(output_folder, out_file_name), "w") as file:
-            json.dump(my_dict, file, indent=4)
+        append_checkpoint(checkpoint, idx, content)
 
         ("##############################################") 
     else:
         print("Plan already exists for index: ", idx)
 
+my_dict = {
+    "task": task,
+    "output_format": output_format,
+    "output_folder_path": output_folder,
+    "predictions": data_contents
+}
+
+# Save the output to a json file
+with open(os.path.join(output_folder, out_file_name), "w") as file:
+    json.dump(my_dict, file, indent=4)
+clear_checkpoint(checkpoint)
+
 #EVALUATION
 with open(os.path.join(output_folder, out_file_name), "r") as file:
     data = json.load(file)